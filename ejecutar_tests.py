@@ -5,46 +5,179 @@ CP-01: VPN Tradicional
 CP-02: VPN Post-Cuántico
 """
 
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import runpy
 import subprocess
 import sys
 import os
+import tempfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LAST_RESULTS_PATH = os.path.join(BASE_DIR, '.last_results.json')
 
 def ejecutar_test(script_name, test_name):
-    """Ejecutar un script de test"""
-    print("\n" + "=" * 80)
-    print(f"  EJECUTANDO {test_name}")
-    print("=" * 80 + "\n")
+    """
+    Ejecutar un script de test dentro del proceso actual
     
-    try:
-        result = subprocess.run([sys.executable, script_name], 
-                              capture_output=False, 
-                              text=True,
-                              cwd=os.path.dirname(os.path.abspath(__file__)))
+    Args:
+        script_name: Nombre del archivo Python del test
+        test_name: Descripción del test
         
-        if result.returncode == 0:
-            print(f"\n✓ {test_name} completado exitosamente")
-            return True
-        else:
-            print(f"\n✗ {test_name} falló")
-            return False
-            
+    Returns:
+        Tupla (exito, salida capturada del test)
+    """
+    buffer = io.StringIO()
+    buffer.write("\n" + "=" * 80 + "\n")
+    buffer.write(f"  EJECUTANDO {test_name}\n")
+    buffer.write("=" * 80 + "\n\n")
+    
+    # Los scripts escriben sus archivos de salida en el directorio actual
+    os.chdir(BASE_DIR)
+    sys.argv = [script_name]
+    
+    try:
+        with contextlib.redirect_stdout(buffer), contextlib.redirect_stderr(buffer):
+            runpy.run_path(os.path.join(BASE_DIR, script_name), run_name="__main__")
+        exito = True
+    except SystemExit as e:
+        exito = e.code in (0, None)
     except Exception as e:
-        print(f"\n✗ Error ejecutando {test_name}: {str(e)}")
-        return False
+        buffer.write(f"\n✗ Error ejecutando {test_name}: {str(e)}\n")
+        exito = False
+    
+    if exito:
+        buffer.write(f"\n✓ {test_name} completado exitosamente\n")
+    else:
+        buffer.write(f"\n✗ {test_name} falló\n")
+    
+    return exito, buffer.getvalue()
+
+def ejecutar_con_pytest(tests, opciones=()):
+    """
+    Ejecutar todos los tests en una sola invocación de pytest con pytest-xdist
+    
+    Args:
+        tests: Lista de tuplas (id, script, descripción)
+        opciones: Argumentos adicionales para pytest (p. ej. --lf, --ff)
+        
+    Returns:
+        Diccionario {id: exito} con los tests ejecutados, o None si
+        pytest/pytest-xdist no están instalados
+    """
+    if importlib.util.find_spec('pytest') is None or importlib.util.find_spec('xdist') is None:
+        return None
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        junit_path = os.path.join(tmp_dir, 'results.xml')
+        cmd = [sys.executable, "-m", "pytest", "-n", "auto", "--dist=loadfile", "-q",
+               "-o", f"cache_dir={os.path.join(BASE_DIR, '.pytest_cache')}",
+               f"--junitxml={junit_path}", *opciones]
+        cmd += [script for _, script, _ in tests]
+        
+        subprocess.run(cmd, cwd=BASE_DIR)
+        
+        if not os.path.exists(junit_path):
+            return {test_id: False for test_id, _, _ in tests}
+        
+        # Un test pasa si su testcase no contiene failure/error/skipped
+        estado_por_modulo = {}
+        for testcase in ET.parse(junit_path).getroot().iter('testcase'):
+            modulo = testcase.get('classname', '').split('.')[-1]
+            exito = all(child.tag in ('properties', 'system-out', 'system-err')
+                        for child in testcase)
+            estado_por_modulo[modulo] = estado_por_modulo.get(modulo, True) and exito
+    
+    # Con --lf pytest omite los tests que ya pasaron; no aparecen en el reporte
+    return {test_id: estado_por_modulo[os.path.splitext(script)[0]]
+            for test_id, script, _ in tests
+            if os.path.splitext(script)[0] in estado_por_modulo}
+
+def ejecutar_en_paralelo(tests):
+    """
+    Ejecutar los scripts de test en paralelo sin depender de pytest
+    
+    Args:
+        tests: Lista de tuplas (id, script, descripción)
+        
+    Returns:
+        Diccionario {id: exito}
+    """
+    # Cada worker importa el script con runpy en lugar de lanzar un nuevo intérprete
+    resultados = {}
+    with ProcessPoolExecutor(max_workers=len(tests)) as executor:
+        futuros = {executor.submit(ejecutar_test, script, nombre): test_id
+                   for test_id, script, nombre in tests}
+        
+        for futuro in as_completed(futuros):
+            exito, salida = futuro.result()
+            print(salida)
+            resultados[futuros[futuro]] = exito
+    
+    # Mantener el orden CP-01, CP-02 en el resumen
+    return {test_id: resultados[test_id] for test_id, _, _ in tests}
 
-def main():
+def cargar_resultados_previos():
+    """Cargar resultados de la última ejecución (vacío si no existen)"""
+    try:
+        with open(LAST_RESULTS_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def guardar_resultados(resultados):
+    """Guardar resultados para permitir --lf en la siguiente ejecución"""
+    with open(LAST_RESULTS_PATH, 'w', encoding='utf-8') as f:
+        json.dump(resultados, f, indent=2)
+
+def parse_args(argv=None):
+    """Parsear argumentos de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Ejecutar los tests CP-01 y CP-02")
+    grupo = parser.add_mutually_exclusive_group()
+    grupo.add_argument('--lf', '--last-failed', dest='lf', action='store_true',
+                       help="Ejecutar solo los tests que fallaron en la última ejecución")
+    grupo.add_argument('--ff', '--failed-first', dest='ff', action='store_true',
+                       help="Ejecutar primero los tests que fallaron en la última ejecución")
+    grupo.add_argument('--all', dest='all', action='store_true',
+                       help="Ejecutar todos los tests ignorando resultados previos (por defecto)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """Ejecutar todos los tests"""
+    args = parse_args(argv)
+    
     print("\n" + "=" * 80)
     print("  SUITE DE PRUEBAS - VPN TRADICIONAL VS POST-CUÁNTICO")
     print("=" * 80)
     
-    resultados = {}
+    tests = [
+        ('CP-01', 'vpn_tradicional_test.py', 'CP-01: VPN Tradicional'),
+        ('CP-02', 'vpn_postcuantico_test.py', 'CP-02: VPN Post-Cuántico')
+    ]
+    
+    previos = cargar_resultados_previos() if (args.lf or args.ff) else {}
+    opciones = ['--lf'] if args.lf else ['--ff'] if args.ff else []
     
-    # Test CP-01: VPN Tradicional
-    resultados['CP-01'] = ejecutar_test('vpn_tradicional_test.py', 'CP-01: VPN Tradicional')
+    # Ejecutar CP-01 y CP-02 en paralelo (son independientes); se prefiere
+    # una sola invocación de pytest -n auto si pytest-xdist está disponible
+    ejecutados = ejecutar_con_pytest(tests, opciones)
+    if ejecutados is None:
+        pendientes = tests
+        if args.lf:
+            # Igual que pytest --lf: si no hay fallos registrados se ejecuta todo
+            fallidos = [t for t in tests if not previos.get(t[0], False)]
+            pendientes = fallidos or tests
+        ejecutados = ejecutar_en_paralelo(pendientes)
     
-    # Test CP-02: VPN Post-Cuántico
-    resultados['CP-02'] = ejecutar_test('vpn_postcuantico_test.py', 'CP-02: VPN Post-Cuántico')
+    # Los tests omitidos por --lf conservan su resultado anterior
+    resultados = {test_id: ejecutados.get(test_id, previos.get(test_id, False))
+                  for test_id, _, _ in tests}
+    guardar_resultados(resultados)
     
     # Resumen final
     print("\n" + "=" * 80)
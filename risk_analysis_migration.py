@@ -3,16 +3,153 @@ Análisis de Riesgos y Plan de Migración para VPN con Criptografía Post-Cuánt
 Incluye análisis de costo-beneficio y roadmap de implementación
 """
 
+import copy
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
+from bisect import bisect_left
 from datetime import datetime, timedelta
-import seaborn as sns
+from functools import cached_property, lru_cache
+from types import MappingProxyType
 from typing import Dict, List, Tuple
 
+try:
+    from numba import njit
+except ImportError:
+    # numba es opcional; sin él los escenarios se calculan en Python puro
+    njit = None
+
+# Estimaciones basadas en expertos de la industria (solo lectura)
+_THREAT_TIMELINE = MappingProxyType({
+    2025: MappingProxyType({
+        'probability': 0.01,
+        'impact': 'Muy Bajo',
+        'quantum_bits': 100,
+        'threat_level': 'Experimental'
+    }),
+    2030: MappingProxyType({
+        'probability': 0.15,
+        'impact': 'Bajo',
+        'quantum_bits': 1000,
+        'threat_level': 'Emergente'
+    }),
+    2035: MappingProxyType({
+        'probability': 0.40,
+        'impact': 'Medio',
+        'quantum_bits': 4000,
+        'threat_level': 'Significativo'
+    }),
+    2040: MappingProxyType({
+        'probability': 0.70,
+        'impact': 'Alto',
+        'quantum_bits': 10000,
+        'threat_level': 'Crítico'
+    }),
+    2045: MappingProxyType({
+        'probability': 0.90,
+        'impact': 'Muy Alto',
+        'quantum_bits': 20000,
+        'threat_level': 'Catastrófico'
+    })
+})
+
+# Año estimado de vulnerabilidad por algoritmo
+_VULNERABILITY_WINDOW = MappingProxyType({
+    'RSA-2048': 2035,
+    'RSA-3072': 2040,
+    'ECC-P256': 2033,
+    'AES-128': 2045,
+    'AES-256': 2055  # Relativamente seguro
+})
+
+_THREAT_RECOMMENDATION = 'Iniciar migración antes de 2030 para mitigar riesgos'
+
+def _heatmap(ax, data: np.ndarray, xlabels: List[str], ylabels: List[str],
+             cmap: str = 'RdYlGn', vmin: float = 0, vmax: float = 10,
+             cbar_label: str = None, max_annotations: int = 200):
+    """
+    Dibujar un heatmap anotado con matplotlib (reemplazo de seaborn.heatmap)
+    
+    Args:
+        ax: Ejes donde dibujar
+        data: Matriz de valores (filas x columnas)
+        xlabels: Etiquetas de columnas
+        ylabels: Etiquetas de filas
+        cmap: Mapa de colores
+        vmin: Valor mínimo de la escala
+        vmax: Valor máximo de la escala
+        cbar_label: Etiqueta de la barra de color
+        max_annotations: Máximo de celdas para anotar valores
+    """
+    im = ax.imshow(data, cmap=cmap, vmin=vmin, vmax=vmax, aspect='auto')
+    ax.figure.colorbar(im, ax=ax, label=cbar_label)
+    ax.set_xticks(range(len(xlabels)))
+    ax.set_xticklabels(xlabels, rotation=90)
+    ax.set_yticks(range(len(ylabels)))
+    ax.set_yticklabels(ylabels)
+    
+    # Anotar cada celda solo en matrices pequeñas; texto claro sobre colores
+    # oscuros según la luminancia relativa (mismo criterio que seaborn)
+    if data.size <= max_annotations:
+        rgb = im.cmap(im.norm(data))[..., :3]
+        rgb = np.where(rgb <= 0.03928, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+        luminance = rgb @ np.array([0.2126, 0.7152, 0.0722])
+        for (i, j), value in np.ndenumerate(data):
+            ax.text(j, i, f'{value:g}', ha='center', va='center',
+                    color='white' if luminance[i, j] < 0.408 else 'black')
+    
+    return im
+
 class RiskAnalyzer:
     """Analizador de riesgos para migración a PQC"""
     
+    # Perfiles de riesgo por algoritmo PQC (10 = mejor)
+    _RISK_PROFILES = {
+        'Kyber-512': {
+            'Seguridad': 7,
+            'Rendimiento': 6,
+            'Compatibilidad': 5,
+            'Costo': 6,
+            'Operacional': 7
+        },
+        'Kyber-768': {
+            'Seguridad': 8,
+            'Rendimiento': 5,
+            'Compatibilidad': 5,
+            'Costo': 7,
+            'Operacional': 6
+        },
+        'Kyber-1024': {
+            'Seguridad': 9,
+            'Rendimiento': 4,
+            'Compatibilidad': 4,
+            'Costo': 8,
+            'Operacional': 5
+        },
+        'Dilithium-2': {
+            'Seguridad': 8,
+            'Rendimiento': 5,
+            'Compatibilidad': 6,
+            'Costo': 6,
+            'Operacional': 6
+        },
+        'Dilithium-3': {
+            'Seguridad': 9,
+            'Rendimiento': 4,
+            'Compatibilidad': 5,
+            'Costo': 7,
+            'Operacional': 5
+        }
+    }
+    
+    # Perfil por defecto para algoritmos tradicionales
+    _DEFAULT_PROFILE = {
+        'Seguridad': 3,  # Bajo contra amenaza cuántica
+        'Rendimiento': 9,  # Excelente rendimiento
+        'Compatibilidad': 10,  # Total compatibilidad
+        'Costo': 10,  # Sin costo adicional
+        'Operacional': 10  # Sin cambios operacionales
+    }
+    
     def __init__(self):
         """Inicializar analizador de riesgos"""
         self.risk_categories = [
@@ -32,53 +169,10 @@ class RiskAnalyzer:
         Returns:
             Diccionario con análisis de amenaza temporal
         """
-        # Estimaciones basadas en expertos de la industria
-        threat_timeline = {
-            2025: {
-                'probability': 0.01,
-                'impact': 'Muy Bajo',
-                'quantum_bits': 100,
-                'threat_level': 'Experimental'
-            },
-            2030: {
-                'probability': 0.15,
-                'impact': 'Bajo',
-                'quantum_bits': 1000,
-                'threat_level': 'Emergente'
-            },
-            2035: {
-                'probability': 0.40,
-                'impact': 'Medio',
-                'quantum_bits': 4000,
-                'threat_level': 'Significativo'
-            },
-            2040: {
-                'probability': 0.70,
-                'impact': 'Alto',
-                'quantum_bits': 10000,
-                'threat_level': 'Crítico'
-            },
-            2045: {
-                'probability': 0.90,
-                'impact': 'Muy Alto',
-                'quantum_bits': 20000,
-                'threat_level': 'Catastrófico'
-            }
-        }
-        
-        # Calcular ventana de vulnerabilidad
-        vulnerability_window = {
-            'RSA-2048': 2035,
-            'RSA-3072': 2040,
-            'ECC-P256': 2033,
-            'AES-128': 2045,
-            'AES-256': 2055  # Relativamente seguro
-        }
-        
         return {
-            'timeline': threat_timeline,
-            'vulnerability_window': vulnerability_window,
-            'recommendation': 'Iniciar migración antes de 2030 para mitigar riesgos'
+            'timeline': _THREAT_TIMELINE,
+            'vulnerability_window': _VULNERABILITY_WINDOW,
+            'recommendation': _THREAT_RECOMMENDATION
         }
     
     def assess_migration_risks(self, crypto_type: str) -> Dict:
@@ -91,57 +185,11 @@ class RiskAnalyzer:
         Returns:
             Evaluación de riesgos
         """
-        risk_profiles = {
-            'Kyber-512': {
-                'Seguridad': 7,
-                'Rendimiento': 6,
-                'Compatibilidad': 5,
-                'Costo': 6,
-                'Operacional': 7
-            },
-            'Kyber-768': {
-                'Seguridad': 8,
-                'Rendimiento': 5,
-                'Compatibilidad': 5,
-                'Costo': 7,
-                'Operacional': 6
-            },
-            'Kyber-1024': {
-                'Seguridad': 9,
-                'Rendimiento': 4,
-                'Compatibilidad': 4,
-                'Costo': 8,
-                'Operacional': 5
-            },
-            'Dilithium-2': {
-                'Seguridad': 8,
-                'Rendimiento': 5,
-                'Compatibilidad': 6,
-                'Costo': 6,
-                'Operacional': 6
-            },
-            'Dilithium-3': {
-                'Seguridad': 9,
-                'Rendimiento': 4,
-                'Compatibilidad': 5,
-                'Costo': 7,
-                'Operacional': 5
-            }
-        }
-        
-        if crypto_type not in risk_profiles:
-            # Perfil por defecto para algoritmos tradicionales
-            return {
-                'Seguridad': 3,  # Bajo contra amenaza cuántica
-                'Rendimiento': 9,  # Excelente rendimiento
-                'Compatibilidad': 10,  # Total compatibilidad
-                'Costo': 10,  # Sin costo adicional
-                'Operacional': 10  # Sin cambios operacionales
-            }
-        
-        return risk_profiles[crypto_type]
+        # Copia para que el llamador pueda modificar el resultado sin
+        # alterar los perfiles compartidos de la clase
+        return dict(self._RISK_PROFILES.get(crypto_type, self._DEFAULT_PROFILE))
     
-    def create_risk_matrix(self, algorithms: List[str]) -> pd.DataFrame:
+    def create_risk_matrix(self, algorithms: List[str]) -> Tuple[np.ndarray, np.ndarray]:
         """
         Crear matriz de riesgos para múltiples algoritmos
         
@@ -149,34 +197,54 @@ class RiskAnalyzer:
             algorithms: Lista de algoritmos a evaluar
             
         Returns:
-            DataFrame con matriz de riesgos
+            Tupla (algoritmos, puntuaciones) con puntuaciones de forma
+            (algoritmos x categorías de riesgo)
         """
-        matrix_data = []
+        scores = np.array([
+            [self._RISK_PROFILES.get(algo, self._DEFAULT_PROFILE)[cat]
+             for cat in self.risk_categories]
+            for algo in algorithms
+        ])
         
-        for algo in algorithms:
-            risks = self.assess_migration_risks(algo)
-            risks['Algorithm'] = algo
-            matrix_data.append(risks)
+        return np.array(algorithms), scores
+    
+    def risk_matrix_to_dataframe(self, algorithms: np.ndarray,
+                                 scores: np.ndarray) -> pd.DataFrame:
+        """
+        Convertir la matriz de riesgos a DataFrame (solo para exportar)
+        
+        Args:
+            algorithms: Nombres de los algoritmos
+            scores: Puntuaciones (algoritmos x categorías de riesgo)
+            
+        Returns:
+            DataFrame con matriz de riesgos
+        """
+        matrix = pd.DataFrame(scores, columns=self.risk_categories)
+        matrix['Algorithm'] = algorithms
         
-        return pd.DataFrame(matrix_data)
+        return matrix
     
-    def visualize_risk_matrix(self, risk_df: pd.DataFrame):
+    def visualize_risk_matrix(self, algorithms: np.ndarray, scores: np.ndarray,
+                              dpi: int = 120, tight: bool = False):
         """
         Visualizar matriz de riesgos
         
         Args:
-            risk_df: DataFrame con datos de riesgos
+            algorithms: Nombres de los algoritmos
+            scores: Puntuaciones (algoritmos x categorías de riesgo)
+            dpi: Resolución de la imagen guardada
+            tight: Ajustar el recuadro de la imagen (requiere un render extra)
         """
-        fig, axes = plt.subplots(1, 2, figsize=(14, 6))
+        # Importación diferida: solo las ejecuciones con gráficas la pagan
+        import matplotlib.pyplot as plt
         
-        # Preparar datos para heatmap
-        heatmap_data = risk_df.set_index('Algorithm')[self.risk_categories]
+        fig, axes = plt.subplots(1, 2, figsize=(14, 6))
         
         # 1. Heatmap de riesgos
         ax1 = axes[0]
-        sns.heatmap(heatmap_data, annot=True, cmap='RdYlGn', 
-                   vmin=0, vmax=10, cbar_kws={'label': 'Puntuación (10=Mejor)'},
-                   ax=ax1)
+        _heatmap(ax1, scores, self.risk_categories, algorithms,
+                 cbar_label='Puntuación (10=Mejor)')
         ax1.set_title('Matriz de Evaluación de Riesgos')
         ax1.set_ylabel('Algoritmo')
         ax1.set_xlabel('Categoría de Riesgo')
@@ -188,15 +256,15 @@ class RiskAnalyzer:
         angles += angles[:1]
         
         # Colores para cada algoritmo
-        colors = plt.cm.Set3(np.linspace(0, 1, len(risk_df)))
+        colors = plt.cm.Set3(np.linspace(0, 1, len(algorithms)))
         
-        for idx, row in risk_df.iterrows():
-            values = [row[cat] for cat in self.risk_categories]
-            values += values[:1]
-            
-            ax2.plot(angles, values, 'o-', linewidth=2, 
-                    label=row['Algorithm'], color=colors[idx])
-            ax2.fill(angles, values, alpha=0.15, color=colors[idx])
+        # Cerrar el polígono repitiendo la primera categoría
+        values = np.hstack([scores, scores[:, :1]])
+        
+        for algo, row_values, color in zip(algorithms, values, colors):
+            ax2.plot(angles, row_values, 'o-', linewidth=2, 
+                    label=algo, color=color)
+            ax2.fill(angles, row_values, alpha=0.15, color=color)
         
         ax2.set_xticks(angles[:-1])
         ax2.set_xticklabels(self.risk_categories, size=8)
@@ -206,14 +274,172 @@ class RiskAnalyzer:
         ax2.grid(True)
         
         plt.tight_layout()
-        plt.savefig('risk_assessment_matrix.png', dpi=300, bbox_inches='tight')
+        plt.savefig('risk_assessment_matrix.png', dpi=dpi,
+                   bbox_inches='tight' if tight else None)
         plt.show()
         
         print("Matriz de riesgos guardada en 'risk_assessment_matrix.png'")
 
+# Costos base en miles de USD
+BASE_COSTS = {
+    'hardware_upgrade': 50,
+    'software_licenses': 30,
+    'training': 20,
+    'consulting': 40,
+    'testing': 25,
+    'deployment': 35,
+    'monitoring': 15
+}
+
+# Factores de costo por tipo de algoritmo
+COST_FACTORS = {
+    'Kyber-512': 1.0,
+    'Kyber-768': 1.2,
+    'Kyber-1024': 1.5,
+    'Dilithium-2': 1.1,
+    'Dilithium-3': 1.3,
+    'Traditional': 0.0  # Sin costo adicional
+}
+
+# Beneficios base anuales en miles de USD
+BASE_BENEFITS = {
+    'breach_prevention': 500,  # Prevención de brechas
+    'compliance': 100,  # Cumplimiento regulatorio
+    'reputation': 150,  # Protección reputacional
+    'competitive_advantage': 75,  # Ventaja competitiva
+    'future_proofing': 200  # Preparación futura
+}
+
+# Factores de beneficio por tipo
+BENEFIT_FACTORS = {
+    'Kyber-512': 0.7,
+    'Kyber-768': 0.85,
+    'Kyber-1024': 1.0,
+    'Dilithium-2': 0.8,
+    'Dilithium-3': 0.9,
+    'Traditional': 0.1  # Beneficios mínimos
+}
+
+# Sumas de las tablas base para el cálculo en bloque de escenarios
+_BASE_COSTS_TOTAL = float(sum(BASE_COSTS.values()))
+_BASE_BENEFITS_TOTAL = float(sum(BASE_BENEFITS.values()))
+
+def _scenario_kernel(cost_factors, benefit_factors, multipliers, years):
+    """
+    Núcleo numérico de costo/beneficio para N escenarios (compilado con numba si está disponible)
+    
+    Args:
+        cost_factors: Factor de costo por escenario
+        benefit_factors: Factor de beneficio por escenario
+        multipliers: Multiplicador de tamaño de organización por escenario
+        years: Años de proyección
+        
+    Returns:
+        Tupla (costo total por escenario, beneficio acumulado por escenario y año)
+    """
+    n = cost_factors.shape[0]
+    total_cost = np.empty(n)
+    cumulative = np.empty((n, years))
+    
+    for i in range(n):
+        total_cost[i] = _BASE_COSTS_TOTAL * cost_factors[i] * multipliers[i] * 1000
+        
+        annual_base = _BASE_BENEFITS_TOTAL * benefit_factors[i] * multipliers[i] * 1000
+        running = 0.0
+        for year in range(years):
+            # Los beneficios aumentan 10% por año
+            running += annual_base * (1 + (year + 1) * 0.1)
+            cumulative[i, year] = running
+    
+    return total_cost, cumulative
+
+if njit is not None:
+    _scenario_kernel = njit(cache=True)(_scenario_kernel)
+
+@lru_cache(maxsize=None)
+def _implementation_costs(multiplier: float, crypto_type: str) -> Dict:
+    """
+    Calcular costos de implementación (resultado cacheado y compartido; no modificar)
+    
+    Args:
+        multiplier: Multiplicador por tamaño de organización
+        crypto_type: Tipo de criptografía PQC
+        
+    Returns:
+        Desglose de costos en USD
+    """
+    factor = COST_FACTORS.get(crypto_type, 1.0)
+    
+    detailed_costs = {}
+    total_cost = 0
+    
+    for category, base_cost in BASE_COSTS.items():
+        cost = base_cost * factor * multiplier
+        detailed_costs[category] = cost * 1000  # Convertir a USD
+        total_cost += cost * 1000
+    
+    return {
+        'breakdown': detailed_costs,
+        'total': total_cost,
+        'annual_maintenance': total_cost * 0.15  # 15% anual
+    }
+
+@lru_cache(maxsize=None)
+def _benefits(multiplier: float, crypto_type: str, years: int) -> Dict:
+    """
+    Calcular beneficios de implementación (resultado cacheado y compartido; no modificar)
+    
+    Args:
+        multiplier: Multiplicador por tamaño de organización
+        crypto_type: Tipo de criptografía
+        years: Años de proyección
+        
+    Returns:
+        Beneficios proyectados
+    """
+    factor = BENEFIT_FACTORS.get(crypto_type, 0.5)
+    
+    # Los beneficios aumentan con el tiempo: 10% de aumento anual
+    year_numbers = np.arange(1, years + 1)
+    time_factors = 1 + (year_numbers * 0.1)
+    
+    # Matriz (años x categorías) calculada en una sola operación
+    base = np.array(list(BASE_BENEFITS.values()), dtype=float)
+    benefit_matrix = base[None, :] * factor * multiplier * time_factors[:, None] * 1000
+    annual_benefits = benefit_matrix.sum(axis=1)
+    cumulative_benefits = annual_benefits.cumsum()
+    
+    categories = list(BASE_BENEFITS.keys())
+    yearly_benefits = [
+        {
+            'year': int(year),
+            'annual_benefit': float(annual),
+            'cumulative_benefit': float(cumulative),
+            'breakdown': dict(zip(categories, row.tolist()))
+        }
+        for year, annual, cumulative, row in zip(year_numbers, annual_benefits,
+                                                 cumulative_benefits, benefit_matrix)
+    ]
+    
+    return {
+        'yearly': yearly_benefits,
+        'cumulative': cumulative_benefits,
+        'total_5_years': float(cumulative_benefits[-1]) if years > 0 else 0
+    }
+
 class CostBenefitAnalyzer:
     """Analizador de costo-beneficio para migración PQC"""
     
+    # Umbrales de ROI (%) ordenados y recomendación para cada tramo
+    _ROI_THRESHOLDS = (0, 20, 50, 100)
+    _ROI_RECOMMENDATIONS = (
+        "No recomendado - Retorno negativo",
+        "Evaluar alternativas - Retorno bajo",
+        "Considerar - Retorno moderado",
+        "Recomendado - Buen retorno de inversión",
+        "Altamente recomendado - Excelente retorno de inversión"
+    )
+    
     def __init__(self, organization_size: str = 'medium'):
         """
         Inicializar analizador
@@ -228,6 +454,10 @@ class CostBenefitAnalyzer:
             'large': 2.5
         }
         self.multiplier = self.size_multipliers.get(organization_size, 1.0)
+        
+        # Figura reutilizada entre llamadas a visualize_cost_benefit
+        self._fig = None
+        self._axes = None
     
     def calculate_implementation_costs(self, crypto_type: str) -> Dict:
         """
@@ -239,42 +469,8 @@ class CostBenefitAnalyzer:
         Returns:
             Desglose de costos en USD
         """
-        # Costos base en miles de USD
-        base_costs = {
-            'hardware_upgrade': 50,
-            'software_licenses': 30,
-            'training': 20,
-            'consulting': 40,
-            'testing': 25,
-            'deployment': 35,
-            'monitoring': 15
-        }
-        
-        # Factores de costo por tipo de algoritmo
-        cost_factors = {
-            'Kyber-512': 1.0,
-            'Kyber-768': 1.2,
-            'Kyber-1024': 1.5,
-            'Dilithium-2': 1.1,
-            'Dilithium-3': 1.3,
-            'Traditional': 0.0  # Sin costo adicional
-        }
-        
-        factor = cost_factors.get(crypto_type, 1.0)
-        
-        detailed_costs = {}
-        total_cost = 0
-        
-        for category, base_cost in base_costs.items():
-            cost = base_cost * factor * self.multiplier
-            detailed_costs[category] = cost * 1000  # Convertir a USD
-            total_cost += cost * 1000
-        
-        return {
-            'breakdown': detailed_costs,
-            'total': total_cost,
-            'annual_maintenance': total_cost * 0.15  # 15% anual
-        }
+        # Copia profunda: el resultado cacheado es compartido por todos los analizadores
+        return copy.deepcopy(_implementation_costs(self.multiplier, crypto_type))
     
     def calculate_benefits(self, crypto_type: str, years: int = 5) -> Dict:
         """
@@ -287,55 +483,8 @@ class CostBenefitAnalyzer:
         Returns:
             Beneficios proyectados
         """
-        # Beneficios base anuales en miles de USD
-        base_benefits = {
-            'breach_prevention': 500,  # Prevención de brechas
-            'compliance': 100,  # Cumplimiento regulatorio
-            'reputation': 150,  # Protección reputacional
-            'competitive_advantage': 75,  # Ventaja competitiva
-            'future_proofing': 200  # Preparación futura
-        }
-        
-        # Factores de beneficio por tipo
-        benefit_factors = {
-            'Kyber-512': 0.7,
-            'Kyber-768': 0.85,
-            'Kyber-1024': 1.0,
-            'Dilithium-2': 0.8,
-            'Dilithium-3': 0.9,
-            'Traditional': 0.1  # Beneficios mínimos
-        }
-        
-        factor = benefit_factors.get(crypto_type, 0.5)
-        
-        yearly_benefits = []
-        cumulative_benefits = 0
-        
-        for year in range(1, years + 1):
-            # Los beneficios aumentan con el tiempo
-            time_factor = 1 + (year * 0.1)  # 10% de aumento anual
-            
-            annual_benefit = 0
-            benefit_breakdown = {}
-            
-            for category, base_benefit in base_benefits.items():
-                benefit = base_benefit * factor * self.multiplier * time_factor * 1000
-                benefit_breakdown[category] = benefit
-                annual_benefit += benefit
-            
-            cumulative_benefits += annual_benefit
-            
-            yearly_benefits.append({
-                'year': year,
-                'annual_benefit': annual_benefit,
-                'cumulative_benefit': cumulative_benefits,
-                'breakdown': benefit_breakdown
-            })
-        
-        return {
-            'yearly': yearly_benefits,
-            'total_5_years': cumulative_benefits
-        }
+        # Copia profunda: el resultado cacheado es compartido por todos los analizadores
+        return copy.deepcopy(_benefits(self.multiplier, crypto_type, years))
     
     def calculate_roi(self, crypto_type: str) -> Dict:
         """
@@ -347,8 +496,9 @@ class CostBenefitAnalyzer:
         Returns:
             Análisis de ROI
         """
-        costs = self.calculate_implementation_costs(crypto_type)
-        benefits = self.calculate_benefits(crypto_type, 5)
+        # Solo lectura: se usan los resultados cacheados sin copiar
+        costs = _implementation_costs(self.multiplier, crypto_type)
+        benefits = _benefits(self.multiplier, crypto_type, 5)
         
         initial_investment = costs['total']
         total_benefits = benefits['total_5_years']
@@ -357,12 +507,11 @@ class CostBenefitAnalyzer:
         net_benefit = total_benefits - (initial_investment + annual_maintenance)
         roi_percentage = (net_benefit / initial_investment) * 100
         
-        # Calcular período de recuperación
-        payback_period = None
-        for year_data in benefits['yearly']:
-            if year_data['cumulative_benefit'] >= initial_investment:
-                payback_period = year_data['year']
-                break
+        # Calcular período de recuperación: primer año cuyo beneficio
+        # acumulado (serie no decreciente) cubre la inversión inicial
+        cumulative = benefits['cumulative']
+        idx = int(np.searchsorted(cumulative, initial_investment))
+        payback_period = idx + 1 if idx < len(cumulative) else None
         
         return {
             'initial_investment': initial_investment,
@@ -376,63 +525,85 @@ class CostBenefitAnalyzer:
     
     def _get_roi_recommendation(self, roi: float) -> str:
         """Obtener recomendación basada en ROI"""
-        if roi > 100:
-            return "Altamente recomendado - Excelente retorno de inversión"
-        elif roi > 50:
-            return "Recomendado - Buen retorno de inversión"
-        elif roi > 20:
-            return "Considerar - Retorno moderado"
-        elif roi > 0:
-            return "Evaluar alternativas - Retorno bajo"
+        # bisect_left: un ROI igual al umbral cae en el tramo inferior (roi > umbral)
+        return self._ROI_RECOMMENDATIONS[bisect_left(self._ROI_THRESHOLDS, roi)]
+    
+    def sweep_scenarios(self, crypto_types: List[str], multipliers: List[float] = None,
+                        years: int = 5) -> pd.DataFrame:
+        """
+        Calcular costo, beneficio, ROI y recuperación para muchos escenarios
+        
+        Args:
+            crypto_types: Tipos de criptografía a evaluar
+            multipliers: Multiplicadores de tamaño de organización
+                (por defecto el de esta instancia)
+            years: Años de proyección
+            
+        Returns:
+            DataFrame con una fila por combinación (algoritmo, multiplicador)
+        """
+        if multipliers is None:
+            multipliers = [self.multiplier]
+        
+        # Producto cartesiano algoritmo x multiplicador como arreglos alineados
+        algorithms = np.repeat(np.asarray(crypto_types), len(multipliers))
+        multiplier_arr = np.tile(np.asarray(multipliers, dtype=float), len(crypto_types))
+        cost_factors = np.array([COST_FACTORS.get(a, 1.0) for a in algorithms])
+        benefit_factors = np.array([BENEFIT_FACTORS.get(a, 0.5) for a in algorithms])
+        
+        total_cost, cumulative_benefit = _scenario_kernel(
+            cost_factors, benefit_factors, multiplier_arr, years)
+        
+        if years > 0:
+            total_benefit = cumulative_benefit[:, -1]
+            # Primer año en que el beneficio acumulado cubre la inversión (10 si no ocurre)
+            recovered = cumulative_benefit >= total_cost[:, None]
+            payback_years = np.where(recovered.any(axis=1), recovered.argmax(axis=1) + 1, 10)
         else:
-            return "No recomendado - Retorno negativo"
+            # Sin años de proyección no hay beneficio (igual que _benefits) ni recuperación
+            total_benefit = np.zeros(len(algorithms))
+            payback_years = np.full(len(algorithms), 10)
+        net_benefit = total_benefit - total_cost * (1 + 0.15 * years)
+        
+        return pd.DataFrame({
+            'algorithm': algorithms,
+            'multiplier': multiplier_arr,
+            'roi_%': net_benefit / total_cost * 100,
+            'payback_years': payback_years,
+            'net_benefit': net_benefit,
+            'total_cost': total_cost,
+            'total_benefit': total_benefit
+        })
     
-    def visualize_cost_benefit(self, algorithms: List[str]):
+    def visualize_cost_benefit(self, algorithms: List[str], dpi: int = 120,
+                               tight: bool = False):
         """
         Visualizar análisis costo-beneficio
         
         Args:
             algorithms: Lista de algoritmos a analizar
+            dpi: Resolución de la imagen guardada
+            tight: Ajustar el recuadro de la imagen (requiere un render extra)
         """
-        fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+        import matplotlib.pyplot as plt
+        
+        # Reutilizar la figura si sigue abierta; solo se limpian los ejes
+        if self._fig is None or not plt.fignum_exists(self._fig.number):
+            self._fig, self._axes = plt.subplots(2, 2, figsize=(14, 10))
+        else:
+            for ax in self._axes.flat:
+                ax.clear()
+        fig, axes = self._fig, self._axes
         fig.suptitle(f'Análisis Costo-Beneficio - Organización {self.org_size.title()}', 
                     fontsize=14, fontweight='bold')
         
-        # Recopilar datos
-        roi_data = []
-        cost_data = []
-        benefit_data = []
-        
-        for algo in algorithms:
-            roi = self.calculate_roi(algo)
-            costs = self.calculate_implementation_costs(algo)
-            benefits = self.calculate_benefits(algo, 5)
-            
-            roi_data.append({
-                'algorithm': algo,
-                'roi_%': roi['roi_percentage'],
-                'payback_years': roi['payback_period_years'] or 10,
-                'net_benefit': roi['net_benefit']
-            })
-            
-            cost_data.append({
-                'algorithm': algo,
-                'total_cost': costs['total']
-            })
-            
-            benefit_data.append({
-                'algorithm': algo,
-                'total_benefit': benefits['total_5_years']
-            })
-        
-        roi_df = pd.DataFrame(roi_data)
-        cost_df = pd.DataFrame(cost_data)
-        benefit_df = pd.DataFrame(benefit_data)
+        # Recopilar datos: todos los algoritmos en una sola pasada vectorizada
+        roi_df = self.sweep_scenarios(algorithms)
         
         # 1. ROI por algoritmo
         ax1 = axes[0, 0]
-        colors = ['green' if r > 50 else 'orange' if r > 0 else 'red' 
-                 for r in roi_df['roi_%']]
+        roi = roi_df['roi_%'].to_numpy()
+        colors = np.select([roi > 50, roi > 0], ['green', 'orange'], default='red')
         ax1.bar(roi_df['algorithm'], roi_df['roi_%'], color=colors)
         ax1.axhline(y=0, color='black', linestyle='-', alpha=0.3)
         ax1.axhline(y=50, color='green', linestyle='--', alpha=0.3, label='ROI Objetivo (50%)')
@@ -445,8 +616,8 @@ class CostBenefitAnalyzer:
         
         # 2. Período de recuperación
         ax2 = axes[0, 1]
-        colors = ['green' if p <= 3 else 'orange' if p <= 5 else 'red' 
-                 for p in roi_df['payback_years']]
+        payback = roi_df['payback_years'].to_numpy()
+        colors = np.select([payback <= 3, payback <= 5], ['green', 'orange'], default='red')
         ax2.bar(roi_df['algorithm'], roi_df['payback_years'], color=colors)
         ax2.axhline(y=3, color='green', linestyle='--', alpha=0.3, label='Objetivo (3 años)')
         ax2.set_xlabel('Algoritmo')
@@ -462,8 +633,8 @@ class CostBenefitAnalyzer:
         x = np.arange(len(algorithms))
         width = 0.35
         
-        ax3.bar(x - width/2, cost_df['total_cost']/1000, width, label='Costo Total', color='#FF6B6B')
-        ax3.bar(x + width/2, benefit_df['total_benefit']/1000, width, label='Beneficio Total', color='#4ECDC4')
+        ax3.bar(x - width/2, roi_df['total_cost']/1000, width, label='Costo Total', color='#FF6B6B')
+        ax3.bar(x + width/2, roi_df['total_benefit']/1000, width, label='Beneficio Total', color='#4ECDC4')
         
         ax3.set_xlabel('Algoritmo')
         ax3.set_ylabel('Miles de USD')
@@ -477,24 +648,21 @@ class CostBenefitAnalyzer:
         ax4 = axes[1, 1]
         best_algo = roi_df.loc[roi_df['roi_%'].idxmax(), 'algorithm']
         
-        costs = self.calculate_implementation_costs(best_algo)
-        benefits = self.calculate_benefits(best_algo, 5)
+        costs = _implementation_costs(self.multiplier, best_algo)
+        benefits = _benefits(self.multiplier, best_algo, 5)
         
-        years = list(range(0, 6))
-        cash_flow = [-costs['total']]  # Inversión inicial
+        years = np.arange(0, 6)
         
-        for year_data in benefits['yearly']:
-            net_cash = year_data['annual_benefit'] - costs['annual_maintenance']
-            if len(cash_flow) == 1:
-                cash_flow.append(net_cash)
-            else:
-                cash_flow.append(cash_flow[-1] + net_cash)
+        # Flujo neto anual y acumulado partiendo de la inversión inicial
+        net_cash = (np.array([year_data['annual_benefit'] for year_data in benefits['yearly']])
+                    - costs['annual_maintenance'])
+        cash_flow = np.concatenate(([-costs['total']], np.cumsum(net_cash) - costs['total']))
         
         ax4.plot(years, cash_flow, 'o-', linewidth=2, markersize=8, color='blue')
         ax4.axhline(y=0, color='black', linestyle='-', alpha=0.3)
-        ax4.fill_between(years, 0, cash_flow, where=[cf >= 0 for cf in cash_flow],
+        ax4.fill_between(years, 0, cash_flow, where=cash_flow >= 0,
                         alpha=0.3, color='green', label='Ganancia')
-        ax4.fill_between(years, 0, cash_flow, where=[cf < 0 for cf in cash_flow],
+        ax4.fill_between(years, 0, cash_flow, where=cash_flow < 0,
                         alpha=0.3, color='red', label='Inversión')
         
         ax4.set_xlabel('Año')
@@ -504,7 +672,8 @@ class CostBenefitAnalyzer:
         ax4.grid(True, alpha=0.3)
         
         plt.tight_layout()
-        plt.savefig('cost_benefit_analysis.png', dpi=300, bbox_inches='tight')
+        plt.savefig('cost_benefit_analysis.png', dpi=dpi,
+                   bbox_inches='tight' if tight else None)
         plt.show()
         
         print("Análisis costo-beneficio guardado en 'cost_benefit_analysis.png'")
@@ -517,14 +686,15 @@ class MigrationPlanner:
         self.start_date = datetime(2025, 11, 25)
         self.phases = []
     
-    def create_migration_roadmap(self) -> List[Dict]:
+    @cached_property
+    def roadmap(self) -> List[Dict]:
         """
-        Crear roadmap de migración
+        Roadmap de migración (se construye una sola vez por instancia)
         
         Returns:
             Lista de fases de migración
         """
-        roadmap = [
+        return [
             {
                 'phase': 1,
                 'name': 'Evaluación y Preparación',
@@ -602,16 +772,31 @@ class MigrationPlanner:
                 'cost_percentage': 20
             }
         ]
+    
+    def create_migration_roadmap(self) -> List[Dict]:
+        """
+        Crear roadmap de migración
         
-        return roadmap
+        Returns:
+            Lista de fases de migración
+        """
+        return self.roadmap
     
-    def generate_gantt_chart(self, roadmap: List[Dict]):
+    def generate_gantt_chart(self, roadmap: List[Dict] = None, dpi: int = 120,
+                             tight: bool = False):
         """
         Generar diagrama de Gantt del roadmap
         
         Args:
-            roadmap: Lista de fases del roadmap
+            roadmap: Lista de fases del roadmap (por defecto self.roadmap)
+            dpi: Resolución de la imagen guardada
+            tight: Ajustar el recuadro de la imagen (requiere un render extra)
         """
+        import matplotlib.pyplot as plt
+        
+        if roadmap is None:
+            roadmap = self.roadmap
+        
         fig, ax = plt.subplots(figsize=(14, 8))
         
         # Colores para cada fase
@@ -626,15 +811,17 @@ class MigrationPlanner:
             for j, activity in enumerate(phase['activities']):
                 y_pos.append(i * 6 + j)
                 labels.append(f"  {activity[:40]}...")
-            
-            # Barra de fase completa
-            start = phase['start_date']
-            duration = timedelta(days=phase['duration_months'] * 30)
-            
-            ax.barh(i * 6 + 2, phase['duration_months'] * 30,
-                   left=(start - self.start_date).days,
-                   height=4.5, color=colors[i], alpha=0.3,
-                   label=f"Fase {phase['phase']}: {phase['name']}")
+        
+        # Inicio (días desde el arranque) y duración de cada fase en una sola pasada
+        start_days = (np.array([phase['start_date'] for phase in roadmap], dtype='datetime64[D]')
+                      - np.datetime64(self.start_date, 'D')).astype(int)
+        durations = np.array([phase['duration_months'] * 30 for phase in roadmap])
+        
+        # Barras de fase completas
+        ax.barh(np.arange(len(roadmap)) * 6 + 2, durations, left=start_days,
+               height=4.5, color=colors[:len(roadmap)], alpha=0.3,
+               label=[f"Fase {phase['phase']}: {phase['name']}" for phase in roadmap],
+               rasterized=True)
         
         # Configurar ejes
         ax.set_yticks(y_pos)
@@ -644,13 +831,16 @@ class MigrationPlanner:
                     fontsize=14, fontweight='bold')
         
         # Agregar líneas de hitos
-        milestones = [90, 270, 450, 540]
+        milestones = start_days + durations
         milestone_labels = ['Fin Evaluación', 'Fin Piloto', 'Fin Expansión', 'Migración Completa']
         
+        # Todas las líneas en un solo LineCollection, de arriba a abajo del eje
+        ax.vlines(milestones, 0, 1, transform=ax.get_xaxis_transform(),
+                 colors='red', linestyles='--', alpha=0.5)
+        label_y = ax.get_ylim()[1]
         for milestone, label in zip(milestones, milestone_labels):
-            ax.axvline(x=milestone, color='red', linestyle='--', alpha=0.5)
-            ax.text(milestone, ax.get_ylim()[1], label, rotation=45,
-                   ha='right', va='bottom', fontsize=8)
+            ax.annotate(label, (milestone, label_y), rotation=45,
+                        ha='right', va='bottom', fontsize=8)
         
         # Leyenda
         ax.legend(loc='upper right', fontsize=8)
@@ -661,85 +851,96 @@ class MigrationPlanner:
         ax.invert_yaxis()
         
         plt.tight_layout()
-        plt.savefig('migration_roadmap.png', dpi=300, bbox_inches='tight')
+        plt.savefig('migration_roadmap.png', dpi=dpi,
+                   bbox_inches='tight' if tight else None)
         plt.show()
         
         print("Roadmap de migración guardado en 'migration_roadmap.png'")
     
-    def generate_implementation_report(self, roadmap: List[Dict]) -> str:
+    def generate_implementation_report(self, roadmap: List[Dict] = None) -> str:
         """
         Generar reporte de implementación
         
         Args:
-            roadmap: Roadmap de migración
+            roadmap: Roadmap de migración (por defecto self.roadmap)
             
         Returns:
             Reporte en texto
         """
-        report = []
-        report.append("=" * 80)
-        report.append("PLAN DE MIGRACIÓN A CRIPTOGRAFÍA POST-CUÁNTICA")
-        report.append("=" * 80)
-        report.append("")
+        if roadmap is None:
+            roadmap = self.roadmap
         
-        report.append("CRONOGRAMA EJECUTIVO")
-        report.append("-" * 40)
+        separator = "=" * 80
+        rule = "-" * 40
         
         total_duration = sum(phase['duration_months'] for phase in roadmap)
-        report.append(f"Duración total del proyecto: {total_duration} meses")
-        report.append(f"Fecha de inicio: November 2025")
         end_date = self.start_date + timedelta(days=total_duration * 30)
-        report.append(f"Fecha de finalización estimada: {end_date.strftime('%B %Y')}")
-        report.append("")
         
+        report = [f"""{separator}
+PLAN DE MIGRACIÓN A CRIPTOGRAFÍA POST-CUÁNTICA
+{separator}
+
+CRONOGRAMA EJECUTIVO
+{rule}
+Duración total del proyecto: {total_duration} meses
+Fecha de inicio: November 2025
+Fecha de finalización estimada: {end_date.strftime('%B %Y')}
+"""]
+        
+        # Un bloque de texto por fase
         for phase in roadmap:
-            report.append(f"\nFASE {phase['phase']}: {phase['name'].upper()}")
-            report.append("-" * 40)
-            report.append(f"Duración: {phase['duration_months']} meses")
-            report.append(f"Inicio: {phase['start_date'].strftime('%B %Y')}")
-            report.append(f"Inversión: {phase['cost_percentage']}% del presupuesto total")
-            
-            report.append("\nActividades principales:")
-            for activity in phase['activities']:
-                report.append(f"  • {activity}")
-            
-            report.append("\nEntregables:")
-            for deliverable in phase['deliverables']:
-                report.append(f"  ✓ {deliverable}")
-        
-        report.append("\n\nFACTORES CRÍTICOS DE ÉXITO")
-        report.append("-" * 40)
-        report.append("1. Compromiso ejecutivo y asignación de recursos")
-        report.append("2. Capacitación continua del personal técnico")
-        report.append("3. Comunicación efectiva con stakeholders")
-        report.append("4. Monitoreo proactivo de métricas de rendimiento")
-        report.append("5. Plan de contingencia y rollback bien definido")
-        
-        report.append("\nRIESGOS PRINCIPALES Y MITIGACIÓN")
-        report.append("-" * 40)
-        report.append("\n1. RIESGO: Degradación del rendimiento")
-        report.append("   MITIGACIÓN: Implementación gradual con monitoreo intensivo")
-        
-        report.append("\n2. RIESGO: Incompatibilidad con sistemas legacy")
-        report.append("   MITIGACIÓN: Modo híbrido durante período de transición")
-        
-        report.append("\n3. RIESGO: Resistencia al cambio del personal")
-        report.append("   MITIGACIÓN: Programa comprehensivo de capacitación")
-        
-        report.append("\n4. RIESGO: Sobrecostos del proyecto")
-        report.append("   MITIGACIÓN: Reserva de contingencia del 20%")
-        
-        report.append("\nMÉTRICAS DE ÉXITO")
-        report.append("-" * 40)
-        report.append("• Tiempo de establecimiento de túnel < 500ms")
-        report.append("• Throughput > 80% del rendimiento actual")
-        report.append("• Disponibilidad del servicio > 99.9%")
-        report.append("• Cero brechas de seguridad durante migración")
-        report.append("• Cumplimiento 100% con estándares NIST")
-        
-        report.append("\n" + "=" * 80)
-        report.append("FIN DEL PLAN DE MIGRACIÓN")
-        report.append("=" * 80)
+            start_str = phase['start_date'].strftime('%B %Y')
+            activities = "\n".join(f"  • {activity}" for activity in phase['activities'])
+            deliverables = "\n".join(f"  ✓ {deliverable}" for deliverable in phase['deliverables'])
+            report.append(f"""
+FASE {phase['phase']}: {phase['name'].upper()}
+{rule}
+Duración: {phase['duration_months']} meses
+Inicio: {start_str}
+Inversión: {phase['cost_percentage']}% del presupuesto total
+
+Actividades principales:
+{activities}
+
+Entregables:
+{deliverables}""")
+        
+        report.append(f"""
+
+FACTORES CRÍTICOS DE ÉXITO
+{rule}
+1. Compromiso ejecutivo y asignación de recursos
+2. Capacitación continua del personal técnico
+3. Comunicación efectiva con stakeholders
+4. Monitoreo proactivo de métricas de rendimiento
+5. Plan de contingencia y rollback bien definido
+
+RIESGOS PRINCIPALES Y MITIGACIÓN
+{rule}
+
+1. RIESGO: Degradación del rendimiento
+   MITIGACIÓN: Implementación gradual con monitoreo intensivo
+
+2. RIESGO: Incompatibilidad con sistemas legacy
+   MITIGACIÓN: Modo híbrido durante período de transición
+
+3. RIESGO: Resistencia al cambio del personal
+   MITIGACIÓN: Programa comprehensivo de capacitación
+
+4. RIESGO: Sobrecostos del proyecto
+   MITIGACIÓN: Reserva de contingencia del 20%
+
+MÉTRICAS DE ÉXITO
+{rule}
+• Tiempo de establecimiento de túnel < 500ms
+• Throughput > 80% del rendimiento actual
+• Disponibilidad del servicio > 99.9%
+• Cero brechas de seguridad durante migración
+• Cumplimiento 100% con estándares NIST
+
+{separator}
+FIN DEL PLAN DE MIGRACIÓN
+{separator}""")
         
         return "\n".join(report)
 
@@ -768,11 +969,21 @@ def main():
     print(f"\n{quantum_threat['recommendation']}")
     
     # Matriz de riesgos
-    risk_matrix = risk_analyzer.create_risk_matrix(algorithms)
+    risk_algorithms, risk_scores = risk_analyzer.create_risk_matrix(algorithms)
+    
+    # El DataFrame solo se construye para exportar
+    risk_matrix = risk_analyzer.risk_matrix_to_dataframe(risk_algorithms, risk_scores)
     risk_matrix.to_csv('risk_matrix.csv', index=False)
     print("\nMatriz de riesgos guardada en 'risk_matrix.csv'")
     
-    risk_analyzer.visualize_risk_matrix(risk_matrix)
+    # Copia columnar para pipelines posteriores (requiere pyarrow)
+    try:
+        risk_matrix.to_parquet('risk_matrix.parquet', index=False)
+        print("Matriz de riesgos guardada en 'risk_matrix.parquet'")
+    except ImportError:
+        print("pyarrow no instalado, se omite 'risk_matrix.parquet'")
+    
+    risk_analyzer.visualize_risk_matrix(risk_algorithms, risk_scores)
     
     # 2. Análisis Costo-Beneficio
     print("\nPARTE 2: ANÁLISIS COSTO-BENEFICIO")
@@ -796,16 +1007,16 @@ def main():
     print("-" * 40)
     
     planner = MigrationPlanner()
-    roadmap = planner.create_migration_roadmap()
+    roadmap = planner.roadmap
     
     print("\nFases del proyecto:")
     for phase in roadmap:
         print(f"  Fase {phase['phase']}: {phase['name']} ({phase['duration_months']} meses)")
     
-    planner.generate_gantt_chart(roadmap)
+    planner.generate_gantt_chart()
     
     # Generar reporte final
-    implementation_report = planner.generate_implementation_report(roadmap)
+    implementation_report = planner.generate_implementation_report()
     
     with open('migration_plan.txt', 'w', encoding='utf-8') as f:
         f.write(implementation_report)
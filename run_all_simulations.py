@@ -5,32 +5,56 @@ Ejecuta todas las simulaciones y genera reporte ejecutivo consolidado
 
 import os
 import sys
+import argparse
+import shutil
+import hashlib
 import subprocess
+import importlib.util
+import importlib.metadata
 import pandas as pd
-import matplotlib.pyplot as plt
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 
+PLOT_CACHE_DIR = '.plot_cache'
+
+# Columnas de vpn_simulation_results.csv que usa el resumen ejecutivo
+SUMMARY_COLUMNS = {
+    'algorithm': 'string',
+    'quantum_resistant': 'bool',
+    'key_size_bytes': 'int32',
+    'key_exchange_time_ms': 'float64',
+    'throughput_mbps': 'float64',
+    'avg_cpu_usage_%': 'float64',
+}
+
 def install_dependencies():
-    """Instalar dependencias necesarias"""
-    print("Instalando dependencias...")
+    """Instalar las dependencias necesarias que no estén disponibles"""
     dependencies = [
         'numpy',
         'pandas',
-        'matplotlib',
-        'seaborn'
+        'matplotlib'
     ]
     
-    for dep in dependencies:
-        try:
-            subprocess.check_call([sys.executable, "-m", "pip", "install", dep, "--quiet", "--break-system-packages"])
+    # Solo se invoca pip para los módulos que no se pueden importar
+    missing = [dep for dep in dependencies if importlib.util.find_spec(dep) is None]
+    if not missing:
+        return
+    
+    print("Instalando dependencias...")
+    try:
+        subprocess.check_call([sys.executable, "-m", "pip", "install", *missing, "--quiet", "--break-system-packages"])
+        for dep in missing:
             print(f"  {dep} instalado")
-        except:
-            print(f"  {dep} ya instalado o error en instalación")
+    except:
+        print(f"  Error instalando: {', '.join(missing)}")
 
 def run_simulation(script_name: str, description: str) -> bool:
     """
     Ejecutar un script de simulación
     
+    La salida del script se redirige a '<script>.log' para que las
+    ejecuciones en paralelo no se mezclen en la consola.
+    
     Args:
         script_name: Nombre del archivo Python
         description: Descripción de la simulación
@@ -38,143 +62,228 @@ def run_simulation(script_name: str, description: str) -> bool:
     Returns:
         True si la ejecución fue exitosa
     """
-    print(f"\n{'='*80}")
-    print(f"Ejecutando: {description}")
-    print('='*80)
+    log_path = f"{script_name}.log"
     
     try:
-        result = subprocess.run([sys.executable, script_name])
+        with open(log_path, 'w', encoding='utf-8') as log:
+            # -O: los scripts no dependen de assert ni de __debug__
+            result = subprocess.run([sys.executable, '-O', script_name],
+                                    stdout=log, stderr=subprocess.STDOUT)
         
         if result.returncode == 0:
             return True
         else:
-            print(f"\n✗ Error en {description}")
+            print(f"\n✗ Error en {description} (ver {log_path})")
             return False
     except Exception as e:
         print(f"\n✗ Error ejecutando {script_name}: {str(e)}")
         return False
 
+# Plantilla del resumen ejecutivo; {pqc_block} se llena con los resultados de simulación
+_SUMMARY_TEMPLATE = """\
+{rule}
+RESUMEN EJECUTIVO
+PROYECTO: VPN CON CRIPTOGRAFÍA POST-CUÁNTICA
+Análisis de Sobrecosto en Diseño y Simulación
+{rule}
+
+Fecha de generación: 25 de noviembre de 2025
+Autores: Daniela Mejía Rivas & Orlando Arzate Alcántara
+
+HALLAZGOS PRINCIPALES
+{subrule}
+{pqc_block}
+3. EVALUACIÓN DE RIESGOS:
+   • Amenaza cuántica significativa esperada para 2035
+   • Ventana de vulnerabilidad para RSA-2048: 2035
+   • Ventana de vulnerabilidad para ECC-P256: 2033
+   • Recomendación: Iniciar migración antes de 2030
+
+4. ANÁLISIS FINANCIERO:
+   • Inversión estimada (empresa mediana): $200,000 - $300,000 USD
+   • ROI esperado a 5 años: 50-100%
+   • Período de recuperación: 2-3 años
+   • Beneficio principal: Prevención de brechas futuras
+
+5. PLAN DE MIGRACIÓN PROPUESTO:
+   • Duración total: 18 meses
+   • Fase 1 (3 meses): Evaluación y preparación
+   • Fase 2 (6 meses): Piloto e implementación híbrida
+   • Fase 3 (6 meses): Expansión controlada
+   • Fase 4 (3 meses): Migración completa
+
+RECOMENDACIONES ESTRATÉGICAS
+{subrule}
+
+1. INMEDIATO (0-3 meses):
+   • Formar comité de evaluación PQC
+   • Auditoría de infraestructura actual
+   • Iniciar capacitación del personal
+
+2. CORTO PLAZO (3-12 meses):
+   • Implementar piloto con Kyber-768
+   • Establecer métricas de monitoreo
+   • Desarrollar plan de contingencia
+
+3. MEDIANO PLAZO (12-24 meses):
+   • Expansión gradual a toda la red
+   • Integración con sistemas de seguridad
+   • Certificación de cumplimiento
+
+CONCLUSIÓN
+{subrule}
+
+La migración a criptografía post-cuántica representa una inversión
+estratégica necesaria para garantizar la seguridad a largo plazo.
+Aunque implica sobrecostos en rendimiento (20-30%) y recursos,
+el riesgo de no actuar supera ampliamente los costos de implementación.
+
+Se recomienda iniciar el proceso de migración en Q1 2025 para
+completar la transición antes de que la amenaza cuántica sea crítica.
+
+DOCUMENTACIÓN GENERADA
+{subrule}
+1. vpn_simulation_results.csv - Datos detallados de simulación
+2. vpn_analysis_report.txt - Reporte técnico completo
+3. remote_access_results.csv - Análisis VPN acceso remoto
+4. risk_matrix.csv - Matriz de evaluación de riesgos
+5. migration_plan.txt - Plan detallado de migración
+6. Visualizaciones: 4 archivos PNG con gráficas
+
+{rule}
+FIN DEL RESUMEN EJECUTIVO
+{rule}"""
+
+_PQC_BLOCK_TEMPLATE = """
+1. IMPACTO EN RENDIMIENTO:
+   • Incremento en latencia de intercambio: {avg_overhead_latency:.1f}%
+   • Incremento en uso de CPU: {avg_overhead_cpu:.1f}%
+   • Reducción de throughput: ~20-30%
+
+2. ALGORITMO PQC RECOMENDADO:
+   • {best_algorithm}
+   • Balance óptimo entre seguridad y rendimiento
+   • Tamaño de clave: {best_key_size:.0f} bytes
+"""
+
+def load_simulation_results(base_path: str):
+    """
+    Cargar las columnas del resumen desde Parquet o, si no existe, desde CSV
+    
+    Args:
+        base_path: Ruta de los resultados sin extensión
+        
+    Returns:
+        DataFrame con las columnas de SUMMARY_COLUMNS, o None si no hay resultados
+    """
+    parquet_path = f"{base_path}.parquet"
+    if os.path.exists(parquet_path):
+        try:
+            return pd.read_parquet(parquet_path, engine='pyarrow',
+                                   columns=list(SUMMARY_COLUMNS), memory_map=True)
+        except ImportError:
+            pass
+    
+    csv_path = f"{base_path}.csv"
+    if os.path.exists(csv_path):
+        return pd.read_csv(csv_path, usecols=list(SUMMARY_COLUMNS), dtype=SUMMARY_COLUMNS)
+    
+    return None
+
 def generate_executive_summary():
     """Generar resumen ejecutivo consolidado"""
     
     print("\nGenerando Resumen Ejecutivo Consolidado...")
     print("-" * 60)
     
-    summary = []
-    summary.append("=" * 80)
-    summary.append("RESUMEN EJECUTIVO")
-    summary.append("PROYECTO: VPN CON CRIPTOGRAFÍA POST-CUÁNTICA")
-    summary.append("Análisis de Sobrecosto en Diseño y Simulación")
-    summary.append("=" * 80)
-    summary.append("")
-    summary.append("Fecha de generación: 25 de noviembre de 2025")
-    summary.append("Autores: Daniela Mejía Rivas & Orlando Arzate Alcántara")
-    summary.append("")
-    
-    # Resumen de resultados principales
-    summary.append("HALLAZGOS PRINCIPALES")
-    summary.append("-" * 40)
+    pqc_block = ""
     
     # Leer resultados si existen
     try:
         # Cargar resultados de simulación principal
-        if os.path.exists('/home/claude/vpn_simulation_results.csv'):
-            df = pd.read_csv('/home/claude/vpn_simulation_results.csv')
-            
+        df = load_simulation_results('/home/claude/vpn_simulation_results')
+        if df is not None:
             # Análisis tradicional vs PQC
             trad = df[~df['quantum_resistant']]
             pqc = df[df['quantum_resistant']]
             
-            avg_overhead_latency = ((pqc['key_exchange_time_ms'].mean() / 
-                                    trad['key_exchange_time_ms'].mean()) - 1) * 100
-            avg_overhead_cpu = ((pqc['avg_cpu_usage_%'].mean() / 
-                               trad['avg_cpu_usage_%'].mean()) - 1) * 100
-            
-            summary.append(f"\n1. IMPACTO EN RENDIMIENTO:")
-            summary.append(f"   • Incremento en latencia de intercambio: {avg_overhead_latency:.1f}%")
-            summary.append(f"   • Incremento en uso de CPU: {avg_overhead_cpu:.1f}%")
-            summary.append(f"   • Reducción de throughput: ~20-30%")
-            
             # Mejor algoritmo PQC
             best_pqc = pqc.loc[pqc['throughput_mbps'].idxmax()]
-            summary.append(f"\n2. ALGORITMO PQC RECOMENDADO:")
-            summary.append(f"   • {best_pqc['algorithm']}")
-            summary.append(f"   • Balance óptimo entre seguridad y rendimiento")
-            summary.append(f"   • Tamaño de clave: {best_pqc['key_size_bytes']:.0f} bytes")
+            
+            pqc_block = _PQC_BLOCK_TEMPLATE.format(
+                avg_overhead_latency=((pqc['key_exchange_time_ms'].mean() / 
+                                       trad['key_exchange_time_ms'].mean()) - 1) * 100,
+                avg_overhead_cpu=((pqc['avg_cpu_usage_%'].mean() / 
+                                   trad['avg_cpu_usage_%'].mean()) - 1) * 100,
+                best_algorithm=best_pqc['algorithm'],
+                best_key_size=best_pqc['key_size_bytes'],
+            )
     except:
-        summary.append("\nNo se pudieron cargar todos los resultados de simulación")
-    
-    # Análisis de riesgos
-    summary.append("\n3. EVALUACIÓN DE RIESGOS:")
-    summary.append("   • Amenaza cuántica significativa esperada para 2035")
-    summary.append("   • Ventana de vulnerabilidad para RSA-2048: 2035")
-    summary.append("   • Ventana de vulnerabilidad para ECC-P256: 2033")
-    summary.append("   • Recomendación: Iniciar migración antes de 2030")
-    
-    # ROI y costos
-    summary.append("\n4. ANÁLISIS FINANCIERO:")
-    summary.append("   • Inversión estimada (empresa mediana): $200,000 - $300,000 USD")
-    summary.append("   • ROI esperado a 5 años: 50-100%")
-    summary.append("   • Período de recuperación: 2-3 años")
-    summary.append("   • Beneficio principal: Prevención de brechas futuras")
-    
-    # Plan de migración
-    summary.append("\n5. PLAN DE MIGRACIÓN PROPUESTO:")
-    summary.append("   • Duración total: 18 meses")
-    summary.append("   • Fase 1 (3 meses): Evaluación y preparación")
-    summary.append("   • Fase 2 (6 meses): Piloto e implementación híbrida")
-    summary.append("   • Fase 3 (6 meses): Expansión controlada")
-    summary.append("   • Fase 4 (3 meses): Migración completa")
-    
-    # Recomendaciones finales
-    summary.append("\nRECOMENDACIONES ESTRATÉGICAS")
-    summary.append("-" * 40)
-    summary.append("\n1. INMEDIATO (0-3 meses):")
-    summary.append("   • Formar comité de evaluación PQC")
-    summary.append("   • Auditoría de infraestructura actual")
-    summary.append("   • Iniciar capacitación del personal")
-    
-    summary.append("\n2. CORTO PLAZO (3-12 meses):")
-    summary.append("   • Implementar piloto con Kyber-768")
-    summary.append("   • Establecer métricas de monitoreo")
-    summary.append("   • Desarrollar plan de contingencia")
-    
-    summary.append("\n3. MEDIANO PLAZO (12-24 meses):")
-    summary.append("   • Expansión gradual a toda la red")
-    summary.append("   • Integración con sistemas de seguridad")
-    summary.append("   • Certificación de cumplimiento")
-    
-    # Conclusión
-    summary.append("\nCONCLUSIÓN")
-    summary.append("-" * 40)
-    summary.append("\nLa migración a criptografía post-cuántica representa una inversión")
-    summary.append("estratégica necesaria para garantizar la seguridad a largo plazo.")
-    summary.append("Aunque implica sobrecostos en rendimiento (20-30%) y recursos,")
-    summary.append("el riesgo de no actuar supera ampliamente los costos de implementación.")
-    summary.append("\nSe recomienda iniciar el proceso de migración en Q1 2025 para")
-    summary.append("completar la transición antes de que la amenaza cuántica sea crítica.")
-    
-    # Archivos generados
-    summary.append("\nDOCUMENTACIÓN GENERADA")
-    summary.append("-" * 40)
-    summary.append("1. vpn_simulation_results.csv - Datos detallados de simulación")
-    summary.append("2. vpn_analysis_report.txt - Reporte técnico completo")
-    summary.append("3. remote_access_results.csv - Análisis VPN acceso remoto")
-    summary.append("4. risk_matrix.csv - Matriz de evaluación de riesgos")
-    summary.append("5. migration_plan.txt - Plan detallado de migración")
-    summary.append("6. Visualizaciones: 4 archivos PNG con gráficas")
-    
-    summary.append("\n" + "=" * 80)
-    summary.append("FIN DEL RESUMEN EJECUTIVO")
-    summary.append("=" * 80)
-    
-    return "\n".join(summary)
+        pqc_block = "\nNo se pudieron cargar todos los resultados de simulación\n"
+    
+    return _SUMMARY_TEMPLATE.format(pqc_block=pqc_block, rule="=" * 80, subrule="-" * 40)
+
+def _dashboard_cache_key() -> str:
+    """
+    Calcular la clave de caché del dashboard
+    
+    Los datos del dashboard están definidos en este módulo, así que el
+    contenido del archivo junto con la versión de matplotlib determina la
+    imagen generada.
+    
+    Returns:
+        Hash md5 en hexadecimal
+    """
+    with open(os.path.abspath(__file__), 'rb') as f:
+        source = f.read()
+    mpl_version = importlib.metadata.version('matplotlib')
+    return hashlib.md5(source + mpl_version.encode()).hexdigest()
+
+# Datos fijos del dashboard ejecutivo
+_DASHBOARD_ALGORITHMS = ('RSA-2048', 'ECC-P256', 'Kyber-512', 'Kyber-768', 'Kyber-1024')
+_SECURITY_SCORES = (3, 4, 7, 8, 9)
+_PERFORMANCE_SCORES = (9, 8, 6, 5, 4)
+
+_THREAT_YEARS = (2025, 2030, 2035, 2040, 2045)
+_THREAT_LEVELS = (1, 15, 40, 70, 90)
+
+_OVERHEAD_METRICS = ('Latencia', 'CPU', 'Memoria', 'Tamaño\nClave')
+_OVERHEAD_PCT = (150, 130, 180, 500)
+_OVERHEAD_COLORS = tuple('orange' if o > 150 else 'yellow' for o in _OVERHEAD_PCT)
+
+_ROI_YEARS = (0, 1, 2, 3, 4, 5)
+_ROI_VALUES = (-100, -50, 0, 40, 80, 120)
+
+_PHASES = ('Eval', 'Piloto', 'Expan.', 'Migr.')
+_PHASE_DURATIONS = (3, 6, 6, 3)
+_PHASE_COLORS = ('#FF6B6B', '#4ECDC4', '#95E1D3', '#FFA07A')
+
+_DECISION_DATA = (
+    ('Criterio', 'Tradicional', 'Kyber-768 (Recomendado)', 'Decisión'),
+    ('Seguridad Cuántica', 'Vulnerable', 'Resistente', 'PQC'),
+    ('Rendimiento', 'Óptimo', '-25%', 'Aceptable'),
+    ('Costo Implementación', '$0', '$250K', 'Justificado'),
+    ('Tiempo Migración', '0 meses', '18 meses', 'Factible'),
+    ('Riesgo 2035', 'Alto', 'Bajo', 'PQC'),
+)
 
 def create_final_dashboard():
     """Crear dashboard final con métricas clave"""
     
     print("\nCreando Dashboard Final...")
     
+    # Reutilizar la imagen si las entradas no cambiaron desde la última ejecución
+    cached_path = os.path.join(PLOT_CACHE_DIR, f"{_dashboard_cache_key()}.png")
+    if os.path.exists(cached_path):
+        shutil.copyfile(cached_path, 'executive_dashboard.png')
+        print("Dashboard ejecutivo sin cambios, copiado desde caché a 'executive_dashboard.png'")
+        return
+    
+    # matplotlib solo se importa cuando realmente hay que dibujar
+    import matplotlib
+    matplotlib.use('Agg')  # El dashboard solo se guarda a disco, no requiere ventana
+    import matplotlib.pyplot as plt
+    
     fig = plt.figure(figsize=(16, 10))
     fig.suptitle('Dashboard Ejecutivo - VPN con Criptografía Post-Cuántica', 
                 fontsize=16, fontweight='bold')
@@ -184,33 +293,26 @@ def create_final_dashboard():
     
     # Panel 1: Comparación de Algoritmos
     ax1 = fig.add_subplot(gs[0, :2])
-    algorithms = ['RSA-2048', 'ECC-P256', 'Kyber-512', 'Kyber-768', 'Kyber-1024']
-    security_scores = [3, 4, 7, 8, 9]
-    performance_scores = [9, 8, 6, 5, 4]
-    
-    x = range(len(algorithms))
+    x = range(len(_DASHBOARD_ALGORITHMS))
     width = 0.35
     
-    ax1.bar([i - width/2 for i in x], security_scores, width, 
+    ax1.bar([i - width/2 for i in x], _SECURITY_SCORES, width, 
            label='Seguridad Cuántica', color='#4ECDC4')
-    ax1.bar([i + width/2 for i in x], performance_scores, width,
+    ax1.bar([i + width/2 for i in x], _PERFORMANCE_SCORES, width,
            label='Rendimiento', color='#FF6B6B')
     
     ax1.set_xlabel('Algoritmo')
     ax1.set_ylabel('Puntuación (1-10)')
     ax1.set_title('Trade-off: Seguridad vs Rendimiento')
     ax1.set_xticks(x)
-    ax1.set_xticklabels(algorithms, rotation=45, ha='right')
+    ax1.set_xticklabels(_DASHBOARD_ALGORITHMS, rotation=45, ha='right')
     ax1.legend()
     ax1.grid(True, alpha=0.3, axis='y')
     
     # Panel 2: Línea de Tiempo de Amenaza
     ax2 = fig.add_subplot(gs[0, 2])
-    years = [2025, 2030, 2035, 2040, 2045]
-    threat_levels = [1, 15, 40, 70, 90]
-    
-    ax2.plot(years, threat_levels, 'o-', linewidth=2, color='red', markersize=8)
-    ax2.fill_between(years, 0, threat_levels, alpha=0.3, color='red')
+    ax2.plot(_THREAT_YEARS, _THREAT_LEVELS, 'o-', linewidth=2, color='red', markersize=8)
+    ax2.fill_between(_THREAT_YEARS, 0, _THREAT_LEVELS, alpha=0.3, color='red')
     ax2.set_xlabel('Año')
     ax2.set_ylabel('Probabilidad (%)')
     ax2.set_title('Evolución de Amenaza Cuántica')
@@ -219,11 +321,7 @@ def create_final_dashboard():
     
     # Panel 3: Métricas de Sobrecosto
     ax3 = fig.add_subplot(gs[1, 0])
-    metrics = ['Latencia', 'CPU', 'Memoria', 'Tamaño\nClave']
-    overhead_pct = [150, 130, 180, 500]
-    colors_bar = ['orange' if o > 150 else 'yellow' for o in overhead_pct]
-    
-    ax3.barh(metrics, overhead_pct, color=colors_bar)
+    ax3.barh(_OVERHEAD_METRICS, _OVERHEAD_PCT, color=_OVERHEAD_COLORS, rasterized=True)
     ax3.set_xlabel('Sobrecosto (%)')
     ax3.set_title('Impacto de PQC vs Tradicional')
     ax3.axvline(x=100, color='black', linestyle='--', alpha=0.5)
@@ -232,15 +330,12 @@ def create_final_dashboard():
     
     # Panel 4: ROI Proyectado
     ax4 = fig.add_subplot(gs[1, 1])
-    years_roi = [0, 1, 2, 3, 4, 5]
-    roi_values = [-100, -50, 0, 40, 80, 120]
-    
-    ax4.plot(years_roi, roi_values, 'o-', linewidth=2, color='green', markersize=8)
-    ax4.fill_between(years_roi, 0, roi_values, 
-                     where=[r >= 0 for r in roi_values],
+    ax4.plot(_ROI_YEARS, _ROI_VALUES, 'o-', linewidth=2, color='green', markersize=8)
+    ax4.fill_between(_ROI_YEARS, 0, _ROI_VALUES, 
+                     where=[r >= 0 for r in _ROI_VALUES],
                      alpha=0.3, color='green', label='Ganancia')
-    ax4.fill_between(years_roi, 0, roi_values,
-                     where=[r < 0 for r in roi_values],
+    ax4.fill_between(_ROI_YEARS, 0, _ROI_VALUES,
+                     where=[r < 0 for r in _ROI_VALUES],
                      alpha=0.3, color='red', label='Inversión')
     ax4.axhline(y=0, color='black', linestyle='-', alpha=0.5)
     ax4.set_xlabel('Año')
@@ -251,12 +346,8 @@ def create_final_dashboard():
     
     # Panel 5: Plan de Migración
     ax5 = fig.add_subplot(gs[1, 2])
-    phases = ['Eval', 'Piloto', 'Expan.', 'Migr.']
-    durations = [3, 6, 6, 3]
-    colors_phase = ['#FF6B6B', '#4ECDC4', '#95E1D3', '#FFA07A']
-    
-    ax5.pie(durations, labels=phases, colors=colors_phase, autopct='%1.0f%%',
-           startangle=90)
+    ax5.pie(_PHASE_DURATIONS, labels=_PHASES, colors=_PHASE_COLORS, autopct='%1.0f%%',
+           startangle=90, wedgeprops={'rasterized': True})
     ax5.set_title('Distribución Temporal\nPlan de Migración (18 meses)')
     
     # Panel 6: Tabla de Decisión
@@ -264,16 +355,7 @@ def create_final_dashboard():
     ax6.axis('tight')
     ax6.axis('off')
     
-    decision_data = [
-        ['Criterio', 'Tradicional', 'Kyber-768 (Recomendado)', 'Decisión'],
-        ['Seguridad Cuántica', 'Vulnerable', 'Resistente', 'PQC'],
-        ['Rendimiento', 'Óptimo', '-25%', 'Aceptable'],
-        ['Costo Implementación', '$0', '$250K', 'Justificado'],
-        ['Tiempo Migración', '0 meses', '18 meses', 'Factible'],
-        ['Riesgo 2035', 'Alto', 'Bajo', 'PQC']
-    ]
-    
-    table = ax6.table(cellText=decision_data, loc='center', cellLoc='center')
+    table = ax6.table(cellText=_DECISION_DATA, loc='center', cellLoc='center')
     table.auto_set_font_size(False)
     table.set_fontsize(9)
     table.scale(1.2, 1.8)
@@ -292,13 +374,25 @@ def create_final_dashboard():
     ax6.set_title('Matriz de Decisión: Migración a PQC', fontweight='bold', pad=20)
     
     plt.tight_layout()
-    plt.savefig('executive_dashboard.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    plt.savefig('executive_dashboard.png', dpi=150, bbox_inches='tight',
+                pil_kwargs={'optimize': True})
+    plt.close(fig)
+    
+    os.makedirs(PLOT_CACHE_DIR, exist_ok=True)
+    shutil.copyfile('executive_dashboard.png', cached_path)
     
     print("Dashboard ejecutivo guardado en 'executive_dashboard.png'")
 
-def main():
+def parse_args(argv=None):
+    """Parsear argumentos de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Ejecutar todas las simulaciones VPN PQC")
+    parser.add_argument('--no-dashboard', dest='no_dashboard', action='store_true',
+                        help="No generar el dashboard ejecutivo (evita importar matplotlib)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """Función principal orquestadora"""
+    args = parse_args(argv)
     
     print("\n" + "=" * 80)
     print("   SISTEMA DE SIMULACIÓN VPN POST-CUÁNTICA")
@@ -323,17 +417,30 @@ def main():
     successful = 0
     failed = 0
     
-    # Ejecutar cada simulación
+    # Los scripts escriben archivos distintos, así que se ejecutan en paralelo
+    pending = []
     for script, description in simulations:
         if os.path.exists(script):
-            if run_simulation(script, description):
-                successful += 1
-            else:
-                failed += 1
+            pending.append((script, description))
         else:
             print(f"Archivo {script} no encontrado")
             failed += 1
     
+    if pending:
+        print(f"\nEjecutando {len(pending)} simulaciones en paralelo...")
+        workers = min(len(pending), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(run_simulation, script, description): (script, description)
+                       for script, description in pending}
+            
+            for future in as_completed(futures):
+                script, description = futures[future]
+                if future.result():
+                    print(f"  ✓ {description} (salida en {script}.log)")
+                    successful += 1
+                else:
+                    failed += 1
+    
     # Generar resumen ejecutivo
     executive_summary = generate_executive_summary()
     
@@ -344,10 +451,13 @@ def main():
     print("\nResumen ejecutivo guardado en 'RESUMEN_EJECUTIVO.txt'")
     
     # Crear dashboard final
-    try:
-        create_final_dashboard()
-    except Exception as e:
-        print(f"Error creando dashboard: {str(e)}")
+    if args.no_dashboard:
+        print("Dashboard ejecutivo omitido (--no-dashboard)")
+    else:
+        try:
+            create_final_dashboard()
+        except Exception as e:
+            print(f"Error creando dashboard: {str(e)}")
     
     # Mostrar resumen en consola
     print("\n" + executive_summary)
@@ -365,11 +475,14 @@ def main():
         'vpn_tradicional_metricas.json',
         'vpn_postcuantico_logs.json',
         'vpn_simulation_results.csv',
+        'vpn_simulation_results.npy',
+        'vpn_simulation_results.parquet',
         'vpn_analysis_report.txt',
         'vpn_analysis_comparison.png',
         'remote_access_results.csv',
         'remote_access_vpn_scalability.png',
         'risk_matrix.csv',
+        'risk_matrix.parquet',
         'risk_assessment_matrix.png',
         'cost_benefit_analysis.png',
         'migration_roadmap.png',
@@ -378,9 +491,13 @@ def main():
         'RESUMEN_EJECUTIVO.txt'
     ]
     
+    # Un solo recorrido del directorio en lugar de exists + getsize por archivo
+    with os.scandir('.') as entries:
+        sizes = {entry.name: entry.stat().st_size for entry in entries if entry.is_file()}
+    
     for i, file in enumerate(output_files, 1):
-        if os.path.exists(file):
-            size = os.path.getsize(file) / 1024  # KB
+        if file in sizes:
+            size = sizes[file] / 1024  # KB
             print(f"  {i:2}. {file:40} ({size:.1f} KB)")
         else:
             print(f"  {i:2}. {file:40} (no generado)")
@@ -6,13 +6,97 @@ Script de prueba para validación de VPN con criptografía post-cuántica
 
 import time
 import json
+import random
+import hmac
 import hashlib
 import secrets
 from datetime import datetime
+from dataclasses import dataclass, asdict
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# ML-KEM-768 (Kyber-768) real si pqcrypto está instalado; si no, se simula
+try:
+    from pqcrypto.kem import ml_kem_768
+    # pqcrypto >= 1.0 usa keygen/encaps/decaps; versiones previas generate_keypair/encrypt/decrypt
+    kem_keygen = getattr(ml_kem_768, 'keygen', None) or ml_kem_768.generate_keypair
+    kem_encaps = getattr(ml_kem_768, 'encaps', None) or ml_kem_768.encrypt
+    kem_decaps = getattr(ml_kem_768, 'decaps', None) or ml_kem_768.decrypt
+except (ImportError, AttributeError):
+    ml_kem_768 = None
+
+# Modelo de costo Kyber-768: (media, desviación estándar) en ms por operación
+KYBER768_COSTOS_MS = {
+    'keygen': (80.0, 5.0),
+    'encaps': (60.0, 4.0),
+    'decaps': (70.0, 4.0),
+}
+
+# Tamaños reales de Kyber-768 en bytes, usados por la simulación
+KYBER768_PK_BYTES = 1184
+KYBER768_SK_BYTES = 2400
+KYBER768_CT_BYTES = 1088
+KYBER768_SS_BYTES = 32
+
+_rng = random.Random()
+
+def costo_simulado_ms(operacion: str) -> float:
+    """
+    Muestrear el costo simulado de una operación Kyber-768 sin bloquear
+    
+    Args:
+        operacion: Operación del modelo ('keygen', 'encaps' o 'decaps')
+        
+    Returns:
+        Tiempo simulado en milisegundos
+    """
+    media, desviacion = KYBER768_COSTOS_MS[operacion]
+    return max(0.0, _rng.gauss(media, desviacion))
+
+@dataclass(slots=True)
+class PQCTestMetrics:
+    """Métricas de CP-02, en el mismo orden en que se escriben al log JSON"""
+    pqcrypto_available: bool = False
+    pqc_algorithm: str = ''
+    key_generation_time_ms: float = 0.0
+    public_key_size_bytes: int = 0
+    private_key_size_bytes: int = 0
+    encapsulation_time_ms: float = 0.0
+    ciphertext_size_bytes: int = 0
+    shared_secret_size_bytes: int = 0
+    decapsulation_time_ms: float = 0.0
+    key_integrity_valid: bool = False
+    hash_alice: str = ''
+    hash_bob: str = ''
+    timestamp: str = ''
+    test_case: str = ''
+    vpn_type: str = ''
+    total_handshake_time_ms: float = 0.0
+
+# Resumen final de CP-02, se imprime en una sola escritura
+RESUMEN_TEMPLATE = """
+{linea}
+  RESUMEN DE RESULTADOS
+{linea}
+✓ Algoritmo: {m.pqc_algorithm}
+✓ Tiempo generación claves: {m.key_generation_time_ms:.2f} ms
+✓ Tiempo encapsulación: {m.encapsulation_time_ms:.2f} ms
+✓ Tiempo desencapsulación: {m.decapsulation_time_ms:.2f} ms
+✓ Tiempo total handshake: {m.total_handshake_time_ms:.2f} ms
+✓ Tamaño clave pública: {m.public_key_size_bytes} bytes
+✓ Tamaño ciphertext: {m.ciphertext_size_bytes} bytes
+✓ Integridad validada: {integridad}
+✓ Archivo de logs: {archivo}
+
+✓ TEST CP-02 COMPLETADO EXITOSAMENTE
+{linea}"""
 
 class VPNPostCuanticoTest:
     def __init__(self):
-        self.metrics = {}
+        self.metrics = PQCTestMetrics()
         self.clave_publica_alice = None
         self.clave_publica_bob = None
         self.secreto_compartido_alice = None
@@ -24,18 +108,17 @@ class VPNPostCuanticoTest:
         
         try:
             # Intentar importar pqcrypto (si está disponible)
-            try:
-                import pqcrypto
-                print("✓ Librería pqcrypto encontrada")
-                self.metrics['pqcrypto_available'] = True
-            except ImportError:
+            if ml_kem_768 is not None:
+                print("✓ Librería pqcrypto encontrada (ML-KEM-768)")
+                self.metrics.pqcrypto_available = True
+            else:
                 print("⚠ pqcrypto no instalada, usando simulación")
-                self.metrics['pqcrypto_available'] = False
+                self.metrics.pqcrypto_available = False
             
             # Verificar módulos de simulación disponibles
             print("✓ Módulos de simulación PQC disponibles")
             print("✓ Algoritmo: Kyber-768 (KEM)")
-            self.metrics['pqc_algorithm'] = 'Kyber-768'
+            self.metrics.pqc_algorithm = 'Kyber-768'
             
             return True
             
@@ -43,93 +126,109 @@ class VPNPostCuanticoTest:
             print(f"✗ Error verificando librerías: {str(e)}")
             return False
     
+    def _generar_par_kyber(self):
+        """
+        Generar un par de claves Kyber-768
+        
+        Returns:
+            Tupla (clave pública, clave privada, costo simulado en ms)
+        """
+        if ml_kem_768 is not None:
+            clave_publica, clave_privada = kem_keygen()
+            return clave_publica, clave_privada, 0.0
+        
+        # Claves simuladas con los tamaños reales de Kyber-768, en una sola lectura del CSPRNG
+        costo = costo_simulado_ms('keygen')  # Kyber-768 toma ~80ms
+        buf = secrets.token_bytes(KYBER768_PK_BYTES + KYBER768_SK_BYTES)
+        return buf[:KYBER768_PK_BYTES], buf[KYBER768_PK_BYTES:], costo
+    
     def generar_claves_kyber(self):
-        """Simular generación de claves Kyber-768"""
+        """Generar claves Kyber-768 (reales con pqcrypto, simuladas si no está)"""
         print("\n[PASO 2] Generando claves post-cuánticas Kyber-768...")
         print("-" * 70)
         
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
-        # Simular generación de par de claves para Alice
+        # Generar par de claves para Alice
         print("[Alice] Generando par de claves...")
-        time.sleep(0.08)  # Kyber-768 toma ~80ms
-        
-        # Generar claves simuladas (en producción usaría pqcrypto.kem.kyber768)
-        self.clave_publica_alice = secrets.token_bytes(1184)  # Tamaño real de clave pública Kyber-768
-        clave_privada_alice = secrets.token_bytes(2400)  # Tamaño real de clave privada
+        self.clave_publica_alice, clave_privada_alice, costo_alice = self._generar_par_kyber()
         
-        elapsed_alice = (time.time() - start_time) * 1000
+        elapsed_alice = (time.perf_counter_ns() - start_time) / 1e6 + costo_alice
         print(f"✓ Claves de Alice generadas en {elapsed_alice:.2f} ms")
         print(f"  - Clave pública: {len(self.clave_publica_alice)} bytes")
         print(f"  - Clave privada: {len(clave_privada_alice)} bytes")
         
-        # Simular generación de par de claves para Bob
+        # Generar par de claves para Bob
         print("\n[Bob] Generando par de claves...")
-        start_bob = time.time()
-        time.sleep(0.08)
-        
-        self.clave_publica_bob = secrets.token_bytes(1184)
-        clave_privada_bob = secrets.token_bytes(2400)
+        start_bob = time.perf_counter_ns()
+        self.clave_publica_bob, clave_privada_bob, costo_bob = self._generar_par_kyber()
         
-        elapsed_bob = (time.time() - start_bob) * 1000
+        elapsed_bob = (time.perf_counter_ns() - start_bob) / 1e6 + costo_bob
         print(f"✓ Claves de Bob generadas en {elapsed_bob:.2f} ms")
         print(f"  - Clave pública: {len(self.clave_publica_bob)} bytes")
         print(f"  - Clave privada: {len(clave_privada_bob)} bytes")
         
-        total_time = (time.time() - start_time) * 1000
-        self.metrics['key_generation_time_ms'] = total_time
-        self.metrics['public_key_size_bytes'] = len(self.clave_publica_alice)
-        self.metrics['private_key_size_bytes'] = len(clave_privada_alice)
+        total_time = (time.perf_counter_ns() - start_time) / 1e6 + costo_alice + costo_bob
+        self.metrics.key_generation_time_ms = total_time
+        self.metrics.public_key_size_bytes = len(self.clave_publica_alice)
+        self.metrics.private_key_size_bytes = len(clave_privada_alice)
         
         print(f"\n✓ Tiempo total de generación: {total_time:.2f} ms")
         
         return clave_privada_alice, clave_privada_bob
     
     def encapsular_secreto(self, clave_publica_bob):
-        """Simular encapsulación de secreto (Alice -> Bob)"""
+        """Encapsular secreto compartido (Alice -> Bob)"""
         print("\n[PASO 3] Encapsulando secreto compartido...")
         print("-" * 70)
         
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
         print("[Alice] Encapsulando secreto usando clave pública de Bob...")
-        time.sleep(0.06)  # Encapsulación Kyber-768 ~60ms
-        
-        # Generar secreto compartido y ciphertext
-        self.secreto_compartido_alice = secrets.token_bytes(32)  # 256 bits
-        ciphertext = secrets.token_bytes(1088)  # Tamaño real de ciphertext Kyber-768
+        if ml_kem_768 is not None:
+            ciphertext, self.secreto_compartido_alice = kem_encaps(clave_publica_bob)
+            costo = 0.0
+        else:
+            costo = costo_simulado_ms('encaps')  # Encapsulación Kyber-768 ~60ms
+            # Generar secreto compartido (256 bits) y ciphertext en una sola lectura
+            buf = secrets.token_bytes(KYBER768_SS_BYTES + KYBER768_CT_BYTES)
+            self.secreto_compartido_alice = buf[:KYBER768_SS_BYTES]
+            ciphertext = buf[KYBER768_SS_BYTES:]
         
-        elapsed = (time.time() - start_time) * 1000
+        elapsed = (time.perf_counter_ns() - start_time) / 1e6 + costo
         
         print(f"✓ Encapsulación completada en {elapsed:.2f} ms")
         print(f"  - Secreto compartido: {len(self.secreto_compartido_alice)} bytes")
         print(f"  - Ciphertext: {len(ciphertext)} bytes")
         
-        self.metrics['encapsulation_time_ms'] = elapsed
-        self.metrics['ciphertext_size_bytes'] = len(ciphertext)
-        self.metrics['shared_secret_size_bytes'] = len(self.secreto_compartido_alice)
+        self.metrics.encapsulation_time_ms = elapsed
+        self.metrics.ciphertext_size_bytes = len(ciphertext)
+        self.metrics.shared_secret_size_bytes = len(self.secreto_compartido_alice)
         
         return ciphertext
     
     def desencapsular_secreto(self, ciphertext, clave_privada_bob):
-        """Simular desencapsulación de secreto (Bob)"""
+        """Desencapsular secreto compartido (Bob)"""
         print("\n[PASO 4] Desencapsulando secreto compartido...")
         print("-" * 70)
         
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
         print("[Bob] Desencapsulando secreto usando clave privada...")
-        time.sleep(0.07)  # Desencapsulación Kyber-768 ~70ms
-        
-        # En simulación, Bob obtiene el mismo secreto
-        self.secreto_compartido_bob = self.secreto_compartido_alice
+        if ml_kem_768 is not None:
+            self.secreto_compartido_bob = kem_decaps(clave_privada_bob, ciphertext)
+            costo = 0.0
+        else:
+            costo = costo_simulado_ms('decaps')  # Desencapsulación Kyber-768 ~70ms
+            # En simulación, Bob obtiene el mismo secreto
+            self.secreto_compartido_bob = self.secreto_compartido_alice
         
-        elapsed = (time.time() - start_time) * 1000
+        elapsed = (time.perf_counter_ns() - start_time) / 1e6 + costo
         
         print(f"✓ Desencapsulación completada en {elapsed:.2f} ms")
         print(f"  - Secreto recuperado: {len(self.secreto_compartido_bob)} bytes")
         
-        self.metrics['decapsulation_time_ms'] = elapsed
+        self.metrics.decapsulation_time_ms = elapsed
         
         return self.secreto_compartido_bob
     
@@ -138,24 +237,25 @@ class VPNPostCuanticoTest:
         print("\n[PASO 5] Validando integridad de claves...")
         print("-" * 70)
         
-        # Calcular hashes
-        hash_alice = hashlib.sha256(self.secreto_compartido_alice).hexdigest()
-        hash_bob = hashlib.sha256(self.secreto_compartido_bob).hexdigest()
+        # Calcular hashes; la comparación se hace sobre los digests binarios
+        digest_alice = hashlib.sha256(self.secreto_compartido_alice).digest()
+        digest_bob = hashlib.sha256(self.secreto_compartido_bob).digest()
         
-        print(f"Hash Alice: {hash_alice[:32]}...")
-        print(f"Hash Bob:   {hash_bob[:32]}...")
+        # Solo se muestran los primeros 16 bytes de cada digest
+        print(f"Hash Alice: {digest_alice[:16].hex()}...")
+        print(f"Hash Bob:   {digest_bob[:16].hex()}...")
         
-        coinciden = hash_alice == hash_bob
+        coinciden = hmac.compare_digest(digest_alice, digest_bob)
         
         if coinciden:
             print("\n✓ VALIDACIÓN EXITOSA: Los secretos compartidos coinciden")
-            self.metrics['key_integrity_valid'] = True
+            self.metrics.key_integrity_valid = True
         else:
             print("\n✗ ERROR: Los secretos compartidos NO coinciden")
-            self.metrics['key_integrity_valid'] = False
+            self.metrics.key_integrity_valid = False
         
-        self.metrics['hash_alice'] = hash_alice
-        self.metrics['hash_bob'] = hash_bob
+        self.metrics.hash_alice = digest_alice.hex()
+        self.metrics.hash_bob = digest_bob.hex()
         
         return coinciden
     
@@ -163,19 +263,24 @@ class VPNPostCuanticoTest:
         """Generar archivo de logs detallados"""
         print("\n[PASO 6] Generando logs detallados...")
         
-        self.metrics['timestamp'] = datetime.now().isoformat()
-        self.metrics['test_case'] = 'CP-02'
-        self.metrics['vpn_type'] = 'Post-Cuántico'
+        self.metrics.timestamp = datetime.now().isoformat()
+        self.metrics.test_case = 'CP-02'
+        self.metrics.vpn_type = 'Post-Cuántico'
         
         # Calcular tiempo total
-        total_time = (self.metrics['key_generation_time_ms'] + 
-                     self.metrics['encapsulation_time_ms'] + 
-                     self.metrics['decapsulation_time_ms'])
-        self.metrics['total_handshake_time_ms'] = total_time
+        total_time = (self.metrics.key_generation_time_ms + 
+                     self.metrics.encapsulation_time_ms + 
+                     self.metrics.decapsulation_time_ms)
+        self.metrics.total_handshake_time_ms = total_time
         
         filename = 'vpn_postcuantico_logs.json'
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(self.metrics, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            # orjson serializa la dataclass directamente a bytes UTF-8
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(self.metrics, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(asdict(self.metrics), f, indent=2, ensure_ascii=False)
         
         print(f"✓ Logs guardados en: {filename}")
         return filename
@@ -208,20 +313,12 @@ class VPNPostCuanticoTest:
             archivo = self.generar_logs_detallados()
             
             # Resumen final
-            print("\n" + "=" * 70)
-            print("  RESUMEN DE RESULTADOS")
-            print("=" * 70)
-            print(f"✓ Algoritmo: {self.metrics['pqc_algorithm']}")
-            print(f"✓ Tiempo generación claves: {self.metrics['key_generation_time_ms']:.2f} ms")
-            print(f"✓ Tiempo encapsulación: {self.metrics['encapsulation_time_ms']:.2f} ms")
-            print(f"✓ Tiempo desencapsulación: {self.metrics['decapsulation_time_ms']:.2f} ms")
-            print(f"✓ Tiempo total handshake: {self.metrics['total_handshake_time_ms']:.2f} ms")
-            print(f"✓ Tamaño clave pública: {self.metrics['public_key_size_bytes']} bytes")
-            print(f"✓ Tamaño ciphertext: {self.metrics['ciphertext_size_bytes']} bytes")
-            print(f"✓ Integridad validada: {'Sí' if self.metrics['key_integrity_valid'] else 'No'}")
-            print(f"✓ Archivo de logs: {archivo}")
-            print("\n✓ TEST CP-02 COMPLETADO EXITOSAMENTE")
-            print("=" * 70)
+            print(RESUMEN_TEMPLATE.format(
+                m=self.metrics,
+                integridad='Sí' if self.metrics.key_integrity_valid else 'No',
+                archivo=archivo,
+                linea="=" * 70,
+            ))
             
             return True
             
@@ -230,6 +327,10 @@ class VPNPostCuanticoTest:
             print("✗ TEST CP-02 FALLÓ")
             return False
 
+def test_cp02_vpn_postcuantico():
+    """Punto de entrada de CP-02 para pytest"""
+    assert VPNPostCuanticoTest().ejecutar_test()
+
 if __name__ == "__main__":
     test = VPNPostCuanticoTest()
     test.ejecutar_test()
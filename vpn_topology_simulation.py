@@ -3,105 +3,223 @@ Simulación de VPN de Acceso Remoto con Análisis de Rendimiento
 Enfoque en escalabilidad y conexiones concurrentes para diferentes algoritmos PQC
 """
 
+import sys
 import numpy as np
+import matplotlib
+if not sys.stdout.isatty():
+    # Sin terminal (p. ej. run_all_simulations redirige a un log) las gráficas solo se guardan
+    matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import pandas as pd
-from typing import List, Dict
-import random
+from functools import cached_property
+from typing import List, Dict, Optional
+from types import MappingProxyType
+
+# Factor de tiempo de conexión por tipo de acceso
+CONNECTION_FACTORS = {
+    'Fiber': 1.0,
+    'Cable': 1.2,
+    'DSL': 1.5,
+    '4G': 1.8
+}
+
+# Códigos enteros de tipo de acceso y sus factores indexados por código
+CONNECTION_TYPES = tuple(CONNECTION_FACTORS)
+_CONN_IDX = {ctype: i for i, ctype in enumerate(CONNECTION_TYPES)}
+_CONN_FACTOR_ARRAY = np.array([CONNECTION_FACTORS[c] for c in CONNECTION_TYPES], dtype=np.float64)
+
+# Tiempo base de conexión (ms) por tipo de crypto (solo lectura); otros tipos usan DEFAULT_BASE_TIME
+BASE_CONNECTION_TIMES = MappingProxyType({
+    'RSA-2048': 100,
+    'ECC-P256': 60,
+    'Kyber-512': 150,
+    'Kyber-768': 200,
+    'Kyber-1024': 250,
+    'Dilithium-2': 180,
+    'Dilithium-3': 220
+})
+DEFAULT_BASE_TIME = 150
+
+# Tiempos base en arreglo, indexados por la posición de cada crypto en la tabla
+_CRYPTO_INDEX = {crypto: i for i, crypto in enumerate(BASE_CONNECTION_TIMES)}
+_BASE_TIMES_ARR = np.array(list(BASE_CONNECTION_TIMES.values()), dtype=np.float64)
+
+# Registro por usuario: distancia (km), código de conexión y ancho de banda (Mbps)
+USER_DTYPE = np.dtype([('distance', 'i4'), ('conn', 'u1'), ('bw', 'i4')])
+
+# Máximo de resultados con semilla explícita cacheados por simulador
+SEEDED_CACHE_SIZE = 256
+
+# Claves del diccionario devuelto por simulate_concurrent_connections
+_CONNECTION_METRIC_KEYS = (
+    'crypto_type',
+    'concurrent_users',
+    'avg_connection_time_ms',
+    'max_connection_time_ms',
+    'min_connection_time_ms',
+    'success_rate_%',
+    'failed_connections'
+)
+
+def _row_stats(times):
+    """
+    Calcular media, máximo y mínimo de cada fila de tiempos de conexión
+    
+    Args:
+        times: Matriz (filas x usuarios) de tiempos en ms
+        
+    Returns:
+        Tupla de arreglos (media, máximo, mínimo), uno por fila
+    """
+    return times.mean(axis=1), times.max(axis=1), times.min(axis=1)
 
 class RemoteAccessVPN:
     """Simulador de VPN de Acceso Remoto"""
     
-    def __init__(self, num_users: int = 100):
+    def __init__(self, num_users: int = 100, seed: Optional[int] = None):
         """
         Inicializar simulador de VPN de acceso remoto
         
         Args:
             num_users: Número de usuarios remotos
+            seed: Semilla del generador aleatorio (None para no reproducible)
         """
         self.num_users = num_users
-        self.user_locations = self._generate_user_locations()
+        self._rng = np.random.default_rng(seed)
+        
+        # Atributos de usuarios en un arreglo estructurado compacto, generado en bloque
+        self.user_arr = np.zeros(num_users, dtype=USER_DTYPE)
+        self.user_arr['distance'] = self._rng.integers(5, 1001, num_users)
+        self.user_arr['conn'] = self._rng.integers(0, len(CONNECTION_TYPES), num_users)
+        self.user_arr['bw'] = self._rng.choice([10, 25, 50, 100, 200], num_users)
+        
+        # Columnas contiguas en float para los cálculos vectorizados
+        self.distances = self.user_arr['distance'].astype(np.float64)
+        self.conn_factors = _CONN_FACTOR_ARRAY[self.user_arr['conn']]
+        
+        # Los usuarios no se modifican en sitio: los resultados cacheados dependen de ellos
+        for arr in (self.user_arr, self.distances, self.conn_factors):
+            arr.setflags(write=False)
+        
+        # Resultados con semilla explícita, cacheados por instancia (ver _seeded_metrics)
+        self._seeded_cache = {}
+        self._seeded_cache_users = (self.distances, self.conn_factors)
     
-    def _generate_user_locations(self) -> List[Dict]:
-        """Generar ubicaciones aleatorias de usuarios"""
-        locations = []
-        for i in range(self.num_users):
-            locations.append({
+    @cached_property
+    def user_locations(self) -> List[Dict]:
+        """
+        Lista de usuarios como diccionarios, construida desde user_arr en el primer acceso
+        y reutilizada después (user_arr es de solo lectura)
+        
+        Returns:
+            Lista de diccionarios, uno por usuario
+        """
+        return [
+            {
                 'user_id': f'USER_{i:03d}',
-                'distance_km': random.randint(5, 1000),
-                'connection_type': random.choice(['Fiber', 'Cable', 'DSL', '4G']),
-                'bandwidth_mbps': random.choice([10, 25, 50, 100, 200])
-            })
-        return locations
+                'distance_km': distance,
+                'connection_type': CONNECTION_TYPES[ctype],
+                'bandwidth_mbps': bandwidth
+            }
+            for i, (distance, ctype, bandwidth) in enumerate(self.user_arr.tolist())
+        ]
     
-    def simulate_concurrent_connections(self, crypto_type: str, 
-                                       concurrent_users: int) -> Dict:
+    def _connection_metrics(self, crypto_type: str, concurrent_users: int,
+                            rng: np.random.Generator) -> tuple:
         """
-        Simular conexiones concurrentes
+        Calcular las métricas de conexiones concurrentes con el generador dado
         
         Args:
             crypto_type: Tipo de criptografía
             concurrent_users: Número de usuarios concurrentes
+            rng: Generador aleatorio a consumir
             
         Returns:
-            Métricas de conexiones concurrentes
+            Tupla (promedio, máximo, mínimo, tasa de éxito %, conexiones fallidas)
         """
         # Seleccionar usuarios aleatorios
-        active_users = random.sample(self.user_locations, 
-                                   min(concurrent_users, len(self.user_locations)))
-        
-        connection_times = []
-        successful_connections = 0
-        failed_connections = 0
+        n_active = min(concurrent_users, self.num_users)
+        idx = rng.choice(self.num_users, size=n_active, replace=False)
         
         # Tiempo base de conexión por tipo de crypto
-        base_times = {
-            'RSA-2048': 100,
-            'ECC-P256': 60,
-            'Kyber-512': 150,
-            'Kyber-768': 200,
-            'Kyber-1024': 250,
-            'Dilithium-2': 180,
-            'Dilithium-3': 220
-        }
+        base_time = BASE_CONNECTION_TIMES.get(crypto_type, DEFAULT_BASE_TIME)
         
-        base_time = base_times.get(crypto_type, 150)
+        # Tiempo de conexión por usuario: factor de distancia y de tipo de conexión
+        connection_times = base_time * (1 + self.distances[idx] / 1000) * self.conn_factors[idx]
         
-        for user in active_users:
-            # Factor de distancia
-            distance_factor = 1 + (user['distance_km'] / 1000)
-            
-            # Factor de tipo de conexión
-            connection_factors = {
-                'Fiber': 1.0,
-                'Cable': 1.2,
-                'DSL': 1.5,
-                '4G': 1.8
-            }
-            conn_factor = connection_factors[user['connection_type']]
-            
-            # Calcular tiempo de conexión
-            connection_time = base_time * distance_factor * conn_factor
+        # Simular fallo de conexión (más probable con más usuarios)
+        failure_probability = min(0.3, concurrent_users / 500)
+        failed = rng.random(n_active) < failure_probability
+        connection_times = np.where(failed, connection_times * 3, connection_times)  # Reintentos
+        
+        failed_connections = int(failed.sum())
+        successful_connections = n_active - failed_connections
+        
+        return (connection_times.mean(),
+                connection_times.max(),
+                connection_times.min(),
+                (successful_connections / concurrent_users) * 100,
+                failed_connections)
+    
+    def _seeded_metrics(self, crypto_type: str, concurrent_users: int, seed) -> tuple:
+        """
+        Métricas con un generador propio sembrado, cacheadas por instancia
+        
+        Args:
+            crypto_type: Tipo de criptografía
+            concurrent_users: Número de usuarios concurrentes
+            seed: Semilla aceptada por np.random.default_rng
             
-            # Simular fallo de conexión (más probable con más usuarios)
-            failure_probability = min(0.3, concurrent_users / 500)
-            if random.random() < failure_probability:
-                failed_connections += 1
-                connection_time *= 3  # Tiempo adicional por reintentos
-            else:
-                successful_connections += 1
+        Returns:
+            Tupla de métricas, igual que _connection_metrics
+        """
+        # Generadores y secuencias ya construidos no tienen una clave estable: sin caché
+        if isinstance(seed, (np.random.SeedSequence, np.random.BitGenerator, np.random.Generator)):
+            return self._connection_metrics(crypto_type, concurrent_users,
+                                            np.random.default_rng(seed))
+        
+        # Validar y normalizar la semilla (int o secuencia de ints) a una clave hashable
+        seed_seq = np.random.SeedSequence(seed)
+        entropy = seed_seq.entropy
+        seed_key = (entropy,) if isinstance(entropy, int) else tuple(int(x) for x in entropy)
+        
+        # Si se reasignaron los arreglos de usuarios, los resultados cacheados ya no valen
+        cached_users = self._seeded_cache_users
+        if cached_users[0] is not self.distances or cached_users[1] is not self.conn_factors:
+            self._seeded_cache.clear()
+            self._seeded_cache_users = (self.distances, self.conn_factors)
+        
+        key = (crypto_type, concurrent_users, seed_key)
+        metrics = self._seeded_cache.get(key)
+        if metrics is None:
+            metrics = self._connection_metrics(crypto_type, concurrent_users,
+                                               np.random.default_rng(seed_seq))
+            if len(self._seeded_cache) >= SEEDED_CACHE_SIZE:
+                # Descartar la entrada más antigua (los dict conservan el orden de inserción)
+                del self._seeded_cache[next(iter(self._seeded_cache))]
+            self._seeded_cache[key] = metrics
+        return metrics
+    
+    def simulate_concurrent_connections(self, crypto_type: str, 
+                                       concurrent_users: int,
+                                       seed: Optional[int] = None) -> Dict:
+        """
+        Simular conexiones concurrentes
+        
+        Args:
+            crypto_type: Tipo de criptografía
+            concurrent_users: Número de usuarios concurrentes
+            seed: Semilla opcional; con semilla el resultado es reproducible y se cachea
             
-            connection_times.append(connection_time)
+        Returns:
+            Métricas de conexiones concurrentes
+        """
+        if seed is None:
+            metrics = self._connection_metrics(crypto_type, concurrent_users, self._rng)
+        else:
+            metrics = self._seeded_metrics(crypto_type, concurrent_users, seed)
         
-        return {
-            'crypto_type': crypto_type,
-            'concurrent_users': concurrent_users,
-            'avg_connection_time_ms': np.mean(connection_times),
-            'max_connection_time_ms': np.max(connection_times),
-            'min_connection_time_ms': np.min(connection_times),
-            'success_rate_%': (successful_connections / concurrent_users) * 100,
-            'failed_connections': failed_connections
-        }
+        return dict(zip(_CONNECTION_METRIC_KEYS, (crypto_type, concurrent_users) + metrics))
     
     def simulate_scalability_test(self, crypto_types: List[str]) -> pd.DataFrame:
         """
@@ -113,57 +231,91 @@ class RemoteAccessVPN:
         Returns:
             DataFrame con resultados de escalabilidad
         """
-        results = []
         user_counts = [10, 25, 50, 100, 150, 200, 250, 300]
+        n_crypto = len(crypto_types)
+        crypto_idx = np.array([_CRYPTO_INDEX.get(c, -1) for c in crypto_types], dtype=np.intp)
+        base_times = np.where(crypto_idx >= 0, _BASE_TIMES_ARR[crypto_idx], DEFAULT_BASE_TIME)
         
         print(f"\nSimulando VPN de Acceso Remoto para {self.num_users} usuarios")
         print("-" * 60)
         
-        for user_count in user_counts:
+        # Categorías únicas en orden de aparición; un algoritmo repetido conserva sus filas
+        categories = list(dict.fromkeys(crypto_types))
+        category_codes = {crypto: i for i, crypto in enumerate(categories)}
+        crypto_codes = np.array([category_codes[c] for c in crypto_types], dtype=np.intp)
+        
+        # Columnas preasignadas; filas en orden (carga, algoritmo), igual que las llamadas individuales
+        n_rows = len(user_counts) * n_crypto
+        concurrent_users = np.repeat(np.array(user_counts, dtype=np.int64), n_crypto)
+        columns = {
+            'crypto_type': pd.Categorical.from_codes(np.tile(crypto_codes, len(user_counts)),
+                                                     categories=categories, ordered=True),
+            'concurrent_users': concurrent_users,
+            'avg_connection_time_ms': np.empty(n_rows),
+            'max_connection_time_ms': np.empty(n_rows),
+            'min_connection_time_ms': np.empty(n_rows),
+            'success_rate_%': np.empty(n_rows),
+            'failed_connections': np.empty(n_rows, dtype=np.int64),
+            'quantum_resistant': np.tile([c.startswith(('Kyber', 'Dilithium')) for c in crypto_types],
+                                         len(user_counts))
+        }
+        
+        for k, user_count in enumerate(user_counts):
             print(f"  Testing con {user_count} usuarios concurrentes...")
             
-            for crypto_type in crypto_types:
-                metrics = self.simulate_concurrent_connections(crypto_type, user_count)
-                metrics['quantum_resistant'] = crypto_type.startswith(('Kyber', 'Dilithium'))
-                results.append(metrics)
+            # Una muestra de usuarios por carga, compartida por todos los algoritmos
+            n_active = min(user_count, self.num_users)
+            idx = self._rng.choice(self.num_users, size=n_active, replace=False)
+            user_factors = (1 + self.distances[idx] / 1000) * self.conn_factors[idx]
+            
+            # Matriz (algoritmos x usuarios) de tiempos de conexión
+            times = base_times[:, None] * user_factors[None, :]
+            failed = self._rng.random((n_crypto, n_active)) < min(0.3, user_count / 500)
+            times = np.where(failed, times * 3, times)
+            
+            rows = slice(k * n_crypto, (k + 1) * n_crypto)
+            failed_connections = failed.sum(axis=1)
+            (columns['avg_connection_time_ms'][rows],
+             columns['max_connection_time_ms'][rows],
+             columns['min_connection_time_ms'][rows]) = _row_stats(times)
+            columns['failed_connections'][rows] = failed_connections
+            columns['success_rate_%'][rows] = (n_active - failed_connections) / user_count * 100
         
-        return pd.DataFrame(results)
+        return pd.DataFrame(columns, copy=False)
     
-    def visualize_scalability(self, df: pd.DataFrame):
+    def visualize_scalability(self, df: pd.DataFrame, dpi: int = 150):
         """
         Visualizar análisis de escalabilidad
         
         Args:
             df: DataFrame con resultados
+            dpi: Resolución de la imagen guardada
         """
         fig, axes = plt.subplots(1, 3, figsize=(15, 5))
         fig.suptitle('Análisis de Escalabilidad - VPN de Acceso Remoto', 
                     fontsize=14, fontweight='bold')
         
-        # Separar tradicionales y PQC
-        traditional = df[~df['quantum_resistant']]
-        pqc = df[df['quantum_resistant']]
-        
-        # 1. Tiempo de conexión vs usuarios
+        # Un solo agrupamiento por algoritmo, reutilizado por ambas gráficas de líneas
         ax1 = axes[0]
-        for crypto in df['crypto_type'].unique():
-            data = df[df['crypto_type'] == crypto]
+        ax2 = axes[1]
+        for crypto, data in df.groupby('crypto_type', observed=True, sort=False):
             style = '--' if 'Kyber' in crypto or 'Dilithium' in crypto else '-'
-            ax1.plot(data['concurrent_users'], data['avg_connection_time_ms'],
+            users = data['concurrent_users'].values
+            
+            # 1. Tiempo de conexión vs usuarios
+            ax1.plot(users, data['avg_connection_time_ms'].values,
                     label=crypto, linestyle=style, marker='o', markersize=5)
+            
+            # 2. Tasa de éxito
+            ax2.plot(users, data['success_rate_%'].values,
+                    label=crypto, linestyle=style, marker='s', markersize=5)
+        
         ax1.set_xlabel('Usuarios Concurrentes')
         ax1.set_ylabel('Tiempo Promedio de Conexión (ms)')
         ax1.set_title('Tiempo de Conexión vs Carga')
         ax1.legend(fontsize=8)
         ax1.grid(True, alpha=0.3)
         
-        # 2. Tasa de éxito
-        ax2 = axes[1]
-        for crypto in df['crypto_type'].unique():
-            data = df[df['crypto_type'] == crypto]
-            style = '--' if 'Kyber' in crypto or 'Dilithium' in crypto else '-'
-            ax2.plot(data['concurrent_users'], data['success_rate_%'],
-                    label=crypto, linestyle=style, marker='s', markersize=5)
         ax2.set_xlabel('Usuarios Concurrentes')
         ax2.set_ylabel('Tasa de Éxito (%)')
         ax2.set_title('Confiabilidad bajo Carga')
@@ -172,7 +324,8 @@ class RemoteAccessVPN:
         
         # 3. Comparación en punto máximo (300 usuarios)
         ax3 = axes[2]
-        max_load = df[df['concurrent_users'] == df['concurrent_users'].max()]
+        loads = df['concurrent_users'].values
+        max_load = df.loc[loads == loads.max()]
         
         x_pos = np.arange(len(max_load))
         colors = ['#FF6B6B' if not qr else '#4ECDC4' 
@@ -187,8 +340,11 @@ class RemoteAccessVPN:
         ax3.grid(True, alpha=0.3, axis='y')
         
         plt.tight_layout()
-        plt.savefig('remote_access_vpn_scalability.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        plt.savefig('remote_access_vpn_scalability.png', dpi=dpi, bbox_inches='tight')
+        
+        # Con el backend Agg no hay ventana que mostrar
+        if plt.get_backend().lower() != 'agg':
+            plt.show()
         
         print("Análisis de escalabilidad guardado en 'remote_access_vpn_scalability.png'")
 
@@ -210,8 +366,14 @@ def main():
     remote_vpn = RemoteAccessVPN(num_users=500)
     remote_results = remote_vpn.simulate_scalability_test(crypto_types)
     
-    # Guardar resultados
-    remote_results.to_csv('remote_access_results.csv', index=False)
+    # Guardar resultados (escritor C++ de pyarrow si está instalado)
+    try:
+        import pyarrow as pa
+        from pyarrow import csv as pacsv
+        pacsv.write_csv(pa.Table.from_pandas(remote_results, preserve_index=False),
+                        'remote_access_results.csv')
+    except ImportError:
+        remote_results.to_csv('remote_access_results.csv', index=False)
     print("Resultados guardados en 'remote_access_results.csv'")
     
     # Visualizar
@@ -222,10 +384,9 @@ def main():
     print("-" * 40)
     
     # Análisis Acceso Remoto
-    remote_summary = remote_results.groupby('crypto_type').agg({
-        'avg_connection_time_ms': 'mean',
-        'success_rate_%': 'mean'
-    })
+    # Una sola reducción cythonizada sobre ambas columnas
+    remote_summary = remote_results.groupby('crypto_type', observed=True)[
+        ['avg_connection_time_ms', 'success_rate_%']].mean()
     
     print("\nRendimiento promedio Acceso Remoto:")
     print(remote_summary.round(2))
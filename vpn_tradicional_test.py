@@ -4,26 +4,172 @@ CP-01: Establecimiento de Túnel VPN Tradicional
 Script de prueba para validación de VPN con criptografía tradicional
 """
 
+import os
+import re
 import time
 import json
+import random
+import select
+import socket
+import shutil
+import struct
 import subprocess
 import platform
 from datetime import datetime
+from typing import List
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# RSA-2048 real si cryptography está instalada; si no, se simula
+try:
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import padding, rsa
+    _OAEP = padding.OAEP(mgf=padding.MGF1(algorithm=hashes.SHA256()),
+                         algorithm=hashes.SHA256(), label=None)
+except ImportError:
+    rsa = None
+
+# Modelo de costo tradicional: (media, desviación estándar) en ms por operación
+TRADICIONAL_COSTOS_MS = {
+    'keygen': (100.0, 8.0),
+    'tunel': (50.0, 4.0),
+}
+
+_rng = random.Random()
+
+def costo_simulado_ms(operacion: str) -> float:
+    """
+    Muestrear el costo simulado de una operación tradicional sin bloquear
+    
+    Args:
+        operacion: Operación del modelo ('keygen' o 'tunel')
+        
+    Returns:
+        Tiempo simulado en milisegundos
+    """
+    media, desviacion = TRADICIONAL_COSTOS_MS[operacion]
+    return max(0.0, _rng.gauss(media, desviacion))
+
+# Sondeo de latencia: destino, número de ecos y espera máxima por las respuestas
+PING_HOST = "8.8.8.8"
+PING_COUNT = 4
+PING_TIMEOUT_S = 2.0
+
+# Sistema operativo (no cambia durante la ejecución)
+_SISTEMA = platform.system()
+
+# Ruta absoluta de ping: junto con close_fds=False permite a subprocess usar posix_spawn
+_PING_EXE = shutil.which("ping") or "ping"
+
+# Salida del comando ping: "min/avg/max[/mdev] = a/b/c..." y "N% packet loss"
+_PING_RE = re.compile(r'=\s*[\d.]+/([\d.]+)/[\d.]+')
+_LOSS_RE = re.compile(r'([\d.]+)%\s*(?:packet loss|de pérdida|pérdida)')
+
+_ICMP_ECHO_REQUEST = 8
+_ICMP_ECHO_REPLY = 0
+
+def _icmp_checksum(data: bytes) -> int:
+    """
+    Calcular el checksum de Internet (RFC 1071) de un mensaje ICMP
+    
+    Args:
+        data: Bytes del mensaje con el campo checksum en cero
+        
+    Returns:
+        Checksum de 16 bits
+    """
+    if len(data) % 2:
+        data += b'\x00'
+    total = sum(struct.unpack(f'!{len(data) // 2}H', data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+def _ping_icmp(host: str, count: int = PING_COUNT, timeout: float = PING_TIMEOUT_S) -> List[float]:
+    """
+    Enviar ecos ICMP desde el propio proceso y medir su tiempo de ida y vuelta
+    
+    Los ecos se envían seguidos y las respuestas se recogen juntas, en lugar de
+    esperar un segundo entre sondeos como el comando ping.
+    
+    Args:
+        host: Dirección IPv4 de destino
+        count: Número de ecos a enviar
+        timeout: Tiempo máximo de espera por todas las respuestas en segundos
+        
+    Returns:
+        RTT en ms de cada respuesta recibida (vacía si no hubo respuestas)
+        
+    Raises:
+        OSError: Si el sistema no permite abrir un socket ICMP (p. ej. PermissionError)
+    """
+    try:
+        # ICMP sin privilegios (Linux con ping_group_range, macOS)
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+        raw = False
+    except OSError:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
+        raw = True
+    
+    with sock:
+        ident = os.getpid() & 0xFFFF
+        enviados = {}
+        for seq in range(count):
+            header = struct.pack('!BBHHH', _ICMP_ECHO_REQUEST, 0, 0, ident, seq)
+            payload = struct.pack('!Q', seq)
+            checksum = _icmp_checksum(header + payload)
+            packet = struct.pack('!BBHHH', _ICMP_ECHO_REQUEST, 0, checksum, ident, seq) + payload
+            enviados[seq] = time.perf_counter_ns()
+            sock.sendto(packet, (host, 0))
+        
+        rtts = {}
+        limite = time.perf_counter() + timeout
+        while len(rtts) < count:
+            restante = limite - time.perf_counter()
+            if restante <= 0 or not select.select([sock], [], [], restante)[0]:
+                break
+            data = sock.recv(1024)
+            recibido = time.perf_counter_ns()
+            
+            # Los sockets raw (y DGRAM en macOS) incluyen la cabecera IP
+            if data and data[0] >> 4 == 4:
+                data = data[(data[0] & 0x0F) * 4:]
+            if len(data) < 8:
+                continue
+            
+            # En DGRAM el kernel reescribe y filtra el identificador; en raw llegan los
+            # ecos de todo el host, así que además debe coincidir el identificador propio
+            tipo, _, _, reply_ident, seq = struct.unpack('!BBHHH', data[:8])
+            if raw and reply_ident != ident:
+                continue
+            if tipo == _ICMP_ECHO_REPLY and seq in enviados and seq not in rtts:
+                rtts[seq] = (recibido - enviados[seq]) / 1e6
+    
+    return list(rtts.values())
 
 class VPNTradicionalTest:
     def __init__(self):
         self.metrics = {}
         self.tunnel_active = False
+        self.clave_privada = None
         
     def generar_claves_tradicionales(self):
-        """Simular generación de claves RSA/ECC"""
+        """Generar claves RSA-2048 (reales con cryptography, simuladas si no está)"""
         print("\n[PASO 1] Generando claves criptográficas tradicionales...")
-        start = time.time()
+        self.metrics['cryptography_available'] = rsa is not None
+        start = time.perf_counter_ns()
         
-        # Simular generación RSA-2048
-        time.sleep(0.1)  # Simulación de tiempo de generación
+        if rsa is not None:
+            self.clave_privada = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+            costo = 0.0
+        else:
+            # Simular generación RSA-2048
+            costo = costo_simulado_ms('keygen')  # Simulación de tiempo de generación
         
-        elapsed = (time.time() - start) * 1000
+        elapsed = (time.perf_counter_ns() - start) / 1e6 + costo
         print(f"✓ Claves RSA-2048 generadas en {elapsed:.2f} ms")
         self.metrics['key_generation_time_ms'] = elapsed
         return True
@@ -31,12 +177,20 @@ class VPNTradicionalTest:
     def establecer_tunel(self):
         """Establecer túnel VPN"""
         print("\n[PASO 2] Estableciendo túnel VPN...")
-        start = time.time()
+        start = time.perf_counter_ns()
         
-        # Simular establecimiento de túnel
-        time.sleep(0.05)
+        if self.clave_privada is not None:
+            # Transporte RSA-OAEP de una clave de sesión, como en el handshake tradicional
+            clave_sesion = os.urandom(32)
+            cifrada = self.clave_privada.public_key().encrypt(clave_sesion, _OAEP)
+            if self.clave_privada.decrypt(cifrada, _OAEP) != clave_sesion:
+                return False
+            costo = 0.0
+        else:
+            # Simular establecimiento de túnel
+            costo = costo_simulado_ms('tunel')
         
-        elapsed = (time.time() - start) * 1000
+        elapsed = (time.perf_counter_ns() - start) / 1e6 + costo
         self.tunnel_active = True
         print(f"✓ Túnel establecido en {elapsed:.2f} ms")
         print(f"✓ Estado del túnel: ACTIVE")
@@ -48,35 +202,15 @@ class VPNTradicionalTest:
         """Medir latencia del túnel"""
         print("\n[PASO 3] Midiendo latencia del túnel...")
         
-        # Detectar sistema operativo
-        sistema = platform.system()
-        
         try:
-            if sistema == "Darwin":  # macOS
-                cmd = ["ping", "-c", "4", "8.8.8.8"]
-            elif sistema == "Windows":
-                cmd = ["ping", "-n", "4", "8.8.8.8"]
-            else:  # Linux
-                cmd = ["ping", "-c", "4", "8.8.8.8"]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-            
-            # Parsear resultados
-            if sistema == "Darwin" or sistema == "Linux":
-                lines = result.stdout.split('\n')
-                for line in lines:
-                    if 'avg' in line or 'promedio' in line:
-                        parts = line.split('=')[1].split('/')
-                        avg_latency = float(parts[1])
-                        self.metrics['latency_avg_ms'] = avg_latency
-                        break
-                
-                # Verificar pérdida de paquetes
-                for line in lines:
-                    if 'packet loss' in line or 'pérdida' in line:
-                        if '0%' in line or '0.0%' in line:
-                            self.metrics['packet_loss_percent'] = 0.0
-                        break
+            try:
+                rtts = _ping_icmp(PING_HOST)
+                if rtts:
+                    self.metrics['latency_avg_ms'] = sum(rtts) / len(rtts)
+                    self.metrics['packet_loss_percent'] = (PING_COUNT - len(rtts)) / PING_COUNT * 100
+            except OSError:
+                # Sin permiso para sockets ICMP: recurrir al comando ping del sistema
+                self._ping_subprocess()
             
             # Si no se pudo parsear, usar valores simulados
             if 'latency_avg_ms' not in self.metrics:
@@ -102,6 +236,32 @@ class VPNTradicionalTest:
             print(f"✓ Pérdida de paquetes: {self.metrics['packet_loss_percent']:.1f}%")
             return True
     
+    def _ping_subprocess(self):
+        """Medir latencia con el comando ping del sistema (requiere parsear su salida)"""
+        sistema = _SISTEMA
+        
+        if sistema == "Darwin":  # macOS
+            cmd = [_PING_EXE, "-c", str(PING_COUNT), PING_HOST]
+        elif sistema == "Windows":
+            cmd = [_PING_EXE, "-n", str(PING_COUNT), PING_HOST]
+        else:  # Linux
+            cmd = [_PING_EXE, "-c", str(PING_COUNT), PING_HOST]
+        
+        # Sin cerrar descriptores heredados se evita el fork+exec completo (posix_spawn)
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=10,
+                                close_fds=False)
+        
+        # Parsear resultados
+        if sistema == "Darwin" or sistema == "Linux":
+            match = _PING_RE.search(result.stdout)
+            if match:
+                self.metrics['latency_avg_ms'] = float(match.group(1))
+            
+            # Verificar pérdida de paquetes
+            match = _LOSS_RE.search(result.stdout)
+            if match:
+                self.metrics['packet_loss_percent'] = float(match.group(1))
+    
     def generar_archivo_metricas(self):
         """Generar archivo JSON con métricas"""
         print("\n[PASO 4] Generando archivo de métricas...")
@@ -112,8 +272,13 @@ class VPNTradicionalTest:
         self.metrics['crypto_algorithm'] = 'RSA-2048'
         
         filename = 'vpn_tradicional_metricas.json'
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(self.metrics, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            # orjson serializa directamente a bytes UTF-8
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(self.metrics, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(self.metrics, f, indent=2, ensure_ascii=False)
         
         print(f"✓ Archivo generado: {filename}")
         return filename
@@ -160,6 +325,10 @@ class VPNTradicionalTest:
             print("✗ TEST CP-01 FALLÓ")
             return False
 
+def test_cp01_vpn_tradicional():
+    """Punto de entrada de CP-01 para pytest"""
+    assert VPNTradicionalTest().ejecutar_test()
+
 if __name__ == "__main__":
     test = VPNTradicionalTest()
     test.ejecutar_test()